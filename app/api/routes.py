@@ -1,45 +1,289 @@
-from fastapi import APIRouter, Request, Body
+import os
+from collections import Counter
+from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Request, Body, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response
+from app.core.config import settings
 from app.core.logging import logger
 from app.services.model_service import get_model_service
-from app.api.schemas import PredictionResponse
+from app.services.sentence_splitter import split_documents
+from app.api.schemas import (
+    DocumentPrediction,
+    DocumentPredictionRequest,
+    DocumentPredictionResponse,
+    JobStatusResponse,
+    JobSubmitResponse,
+    ModelListResponse,
+    PredictionResponse,
+)
 
 router = APIRouter()
 
-@router.post("/predict", tags=["predictions"], response_model=PredictionResponse)
-async def predict_endpoint(
+EXAMPLE_BODY = {
+    "sentences": [
+        "This product is good.",
+        "The story was terrible",
+        "The toy car was okay"
+    ]
+}
+
+def score_sentences(
     request: Request,
-    body: dict = Body({
-        "sentences": [
-            "This product is good.",
-            "The story was terrible",
-            "The toy car was okay"
-        ]
-    })
+    sentences: List[str],
+    model_name: Optional[str] = None,
+    background_tasks: Optional[BackgroundTasks] = None
+) -> List[str]:
+    """
+    Score sentences with the requested model in a single batched call.
+
+    When background tasks are given and a shadow model is configured, the request
+    is offered for shadow evaluation once the response has been sent.
+    """
+    try:
+        model_service = get_model_service(request, model_name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model: {model_name}")
+    logger.info(f"Using model service instance: {id(model_service)} ({model_service.name})")
+    try:
+        predictions = model_service.predict(sentences)
+    except Exception as e:
+        logger.error(f"Prediction failed: {str(e)}")
+        raise RuntimeError(f"Prediction failed: {str(e)}")
+
+    shadow_evaluator = getattr(request.app.state, "shadow_evaluator", None)
+    if background_tasks is not None and shadow_evaluator is not None and model_service.name == settings.DEFAULT_MODEL_NAME:
+        background_tasks.add_task(shadow_evaluator.submit, sentences, predictions)
+    return predictions
+
+def run_prediction(
+    request: Request,
+    sentences: List[str],
+    model_name: Optional[str] = None,
+    background_tasks: Optional[BackgroundTasks] = None
 ):
     """
-    Predict sentiment for a list of sentences.
+    Score sentences with the requested model and build the prediction response.
     """
     import time
-    sentences = body.get("sentences", [])
     # If there are no sentences, return response without processing time
     if not sentences:
         logger.info(f"Received empty input")
         return {"predictions": []}
-    
+
     start_time = time.time()
-    logger.info(f"Received API call with sentences: {sentences}")
-    model_service = get_model_service(request)
-    logger.info(f"Using model service instance: {id(model_service)}")
-    try:
-        predictions = model_service.predict(sentences)
-    except Exception as e:
-        logger.error(f"Prediction failed: {str(e)}")
-        raise RuntimeError(f"Prediction failed: {str(e)}")
-    
+    logger.info(f"Received API call with {len(sentences)} sentences")
+    logger.debug(f"Sentences: {sentences}")
+    predictions = score_sentences(request, sentences, model_name, background_tasks)
+
     processing_time_ms = (time.time() - start_time) * 1000
-    logger.info(f"Predictions: {predictions}, Processing time: {processing_time_ms:.2f}ms")
-    
+    logger.info(f"Scored {len(predictions)} sentences, Processing time: {processing_time_ms:.2f}ms")
+    logger.debug(f"Predictions: {predictions}")
+
     return PredictionResponse(
         predictions=predictions,
         processing_time_ms=processing_time_ms
-    )
\ No newline at end of file
+    )
+
+@router.post("/predict", tags=["predictions"], response_model=PredictionResponse)
+async def predict_endpoint(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    body: dict = Body(EXAMPLE_BODY),
+    x_model_name: Optional[str] = Header(None)
+):
+    """
+    Predict sentiment for a list of sentences.
+
+    The model can be selected with the `X-Model-Name` header; the default model is used otherwise.
+    """
+    # Model loading and scoring are CPU-bound; keep them off the event loop
+    return await run_in_threadpool(run_prediction, request, body.get("sentences", []), x_model_name, background_tasks)
+
+@router.post("/models/{model_name}/predict", tags=["predictions"], response_model=PredictionResponse)
+async def model_predict_endpoint(
+    request: Request,
+    model_name: str,
+    body: dict = Body(EXAMPLE_BODY)
+):
+    """
+    Predict sentiment for a list of sentences with a named model.
+    """
+    return await run_in_threadpool(run_prediction, request, body.get("sentences", []), model_name)
+
+def score_documents(
+    request: Request,
+    body: DocumentPredictionRequest,
+    model_name: Optional[str] = None,
+    background_tasks: Optional[BackgroundTasks] = None
+) -> DocumentPredictionResponse:
+    """
+    Split documents into sentences, score them in one batch and aggregate per document.
+    """
+    import time
+    start_time = time.time()
+    sentences_per_document = split_documents(body.documents)
+    sentences = [sentence for document in sentences_per_document for sentence in document]
+    logger.info(f"Received {len(body.documents)} documents with {len(sentences)} sentences")
+
+    predictions = score_sentences(request, sentences, model_name, background_tasks) if sentences else []
+
+    documents = []
+    offset = 0
+    for document_sentences in sentences_per_document:
+        document_predictions = predictions[offset:offset + len(document_sentences)]
+        offset += len(document_sentences)
+        label_counts = Counter(document_predictions)
+        documents.append(DocumentPrediction(
+            sentences=document_sentences if body.include_sentences else None,
+            predictions=document_predictions,
+            label_counts=dict(label_counts),
+            sentiment=label_counts.most_common(1)[0][0] if label_counts else None
+        ))
+
+    processing_time_ms = (time.time() - start_time) * 1000
+    logger.info(f"Scored {len(documents)} documents, Processing time: {processing_time_ms:.2f}ms")
+    return DocumentPredictionResponse(documents=documents, processing_time_ms=processing_time_ms)
+
+@router.post("/predict/documents", tags=["predictions"], response_model=DocumentPredictionResponse)
+async def predict_documents_endpoint(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    body: DocumentPredictionRequest,
+    x_model_name: Optional[str] = Header(None)
+):
+    """
+    Predict sentiment for whole documents.
+
+    Documents are split into sentences server-side and every sentence from every
+    document is scored in one batched model call. Each document gets its
+    per-sentence labels, label counts and its majority label as `sentiment`.
+    At most `DOCUMENTS_MAX_CHARS` characters are accepted per request.
+    """
+    total_chars = sum(len(document) for document in body.documents)
+    if total_chars > settings.DOCUMENTS_MAX_CHARS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Documents exceed {settings.DOCUMENTS_MAX_CHARS} characters; submit a batch job instead"
+        )
+    # Sentence splitting and scoring are CPU-bound; keep them off the event loop
+    return await run_in_threadpool(score_documents, request, body, x_model_name, background_tasks)
+
+@router.get("/models", tags=["models"], response_model=ModelListResponse)
+async def list_models_endpoint(request: Request):
+    """
+    List the default model and the registered models, with the ones currently loaded.
+    """
+    registry = getattr(request.app.state, "model_registry", None)
+    registered = registry.names() if registry is not None else []
+    loaded = registry.loaded() if registry is not None else []
+    return ModelListResponse(
+        default=settings.DEFAULT_MODEL_NAME,
+        models=[settings.DEFAULT_MODEL_NAME] + registered,
+        loaded=[settings.DEFAULT_MODEL_NAME] + loaded
+    )
+
+def get_job_queue(request: Request):
+    """Get the batch job queue from app state, or fail if jobs are disabled."""
+    job_queue = getattr(request.app.state, "job_queue", None)
+    if job_queue is None:
+        raise HTTPException(status_code=503, detail="Batch jobs are disabled")
+    return job_queue
+
+def job_status(job: dict) -> JobStatusResponse:
+    """Build the status response for a job record."""
+    return JobStatusResponse(
+        job_id=job["id"],
+        status=job["status"],
+        model=job["model"],
+        total=job["total"],
+        processed=job["processed"],
+        error=job["error"],
+        created_at=job["created_at"],
+        started_at=job["started_at"],
+        finished_at=job["finished_at"]
+    )
+
+@router.post("/jobs", tags=["jobs"], response_model=JobSubmitResponse, status_code=202)
+async def submit_job_endpoint(request: Request, x_model_name: Optional[str] = Header(None)):
+    """
+    Submit a batch scoring job.
+
+    The request body is a UTF-8 text file with one sentence per line, at most
+    `JOBS_MAX_UPLOAD_MB` in size. It is streamed to disk and scored by the job
+    runner process; poll `/jobs/{job_id}` and
+    download the predictions from `/jobs/{job_id}/result` when completed.
+    """
+    job_queue = get_job_queue(request)
+    if x_model_name and x_model_name != settings.DEFAULT_MODEL_NAME:
+        registry = getattr(request.app.state, "model_registry", None)
+        if registry is None or x_model_name not in registry.names():
+            raise HTTPException(status_code=404, detail=f"Unknown model: {x_model_name}")
+
+    paths = job_queue.new_job_paths()
+    max_bytes = int(settings.JOBS_MAX_UPLOAD_MB * 1024 * 1024)
+    size = 0
+    total = 0
+    last_byte = b"\n"
+    input_file = open(paths["input_path"], "wb")
+    try:
+        async for chunk in request.stream():
+            if not chunk:
+                continue
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail=f"Job input exceeds {settings.JOBS_MAX_UPLOAD_MB:g} MB")
+            # Disk writes of large uploads must not block the event loop
+            await run_in_threadpool(input_file.write, chunk)
+            total += chunk.count(b"\n")
+            last_byte = chunk[-1:]
+    except BaseException:
+        # Too large, or the client went away: drop the partial upload
+        input_file.close()
+        os.remove(paths["input_path"])
+        raise
+    input_file.close()
+    if last_byte != b"\n":
+        total += 1  # last line without a trailing newline
+    if total == 0:
+        os.remove(paths["input_path"])
+        raise HTTPException(status_code=400, detail="Empty job input")
+
+    job_queue.submit(paths["id"], paths["input_path"], paths["result_path"], total, x_model_name)
+    logger.info(f"Queued batch job {paths['id']} with {total} sentences")
+    return JobSubmitResponse(job_id=paths["id"], status="queued", total=total)
+
+@router.get("/jobs/{job_id}", tags=["jobs"], response_model=JobStatusResponse)
+async def job_status_endpoint(request: Request, job_id: str):
+    """
+    Get the status and progress of a batch scoring job.
+    """
+    job = get_job_queue(request).get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job_status(job)
+
+@router.get("/jobs/{job_id}/result", tags=["jobs"])
+async def job_result_endpoint(request: Request, job_id: str):
+    """
+    Download the predictions of a completed job, one label per input line.
+    """
+    job = get_job_queue(request).get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return FileResponse(job["result_path"], media_type="text/plain", filename=f"{job_id}.predictions.txt")
+
+@router.delete("/jobs/{job_id}", tags=["jobs"], status_code=204)
+async def delete_job_endpoint(request: Request, job_id: str):
+    """
+    Delete a queued or finished job together with its input and result files.
+    """
+    job_queue = get_job_queue(request)
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    if not job_queue.delete(job_id):
+        raise HTTPException(status_code=409, detail="Job is running")
+    return Response(status_code=204)
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 class PredictionRequest(BaseModel):
@@ -19,4 +19,44 @@ class PredictionResponse(BaseModel):
                 "predictions": ["positive", "neutral", "negative"],
                 "processing_time_ms": 42.5
             }
-        }
\ No newline at end of file
+        }
+
+class ModelListResponse(BaseModel):
+    default: str
+    models: List[str]
+    loaded: List[str]
+
+class DocumentPredictionRequest(BaseModel):
+    documents: List[str] = Field(
+        ...,
+        json_schema_extra={
+            "examples": ["I loved this book. The ending was a bit rushed though."]
+        }
+    )
+    include_sentences: bool = True
+
+class DocumentPrediction(BaseModel):
+    sentences: Optional[List[str]] = None
+    predictions: List[str]
+    label_counts: Dict[str, int]
+    sentiment: Optional[str] = None
+
+class DocumentPredictionResponse(BaseModel):
+    documents: List[DocumentPrediction]
+    processing_time_ms: Optional[float] = None
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+    total: int
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    model: Optional[str] = None
+    total: int
+    processed: int
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
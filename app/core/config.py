@@ -1,4 +1,5 @@
 import os
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -17,6 +18,48 @@ class Settings(BaseSettings):
     # Model settings
     MODEL_PATH: str = os.getenv("MODEL_PATH", "models/sentiment_model.pkl")
     LATENCY_THRESHOLD_MS: float = float(os.getenv("LATENCY_THRESHOLD_MS", "300"))
+    # Max whitespace chunks in the serving-side TF-IDF token cache (0 disables it)
+    VECTORIZER_CACHE_SIZE: int = int(os.getenv("VECTORIZER_CACHE_SIZE", "100000"))
+    # Max characters per length-bucketed sub-batch inside a prediction (0, the default, scores the batch in one call)
+    PREDICT_SUB_BATCH_CHARS: int = int(os.getenv("PREDICT_SUB_BATCH_CHARS", "0"))
+    
+    # Max total characters of the documents in one /predict/documents request
+    DOCUMENTS_MAX_CHARS: int = int(os.getenv("DOCUMENTS_MAX_CHARS", "5000000"))
+    
+    # Warm-up settings (run before the service reports ready)
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    WARMUP_BATCH_SIZES: str = os.getenv("WARMUP_BATCH_SIZES", "1,8,64")
+    WARMUP_ROUNDS: int = int(os.getenv("WARMUP_ROUNDS", "2"))
+    
+    # Model registry settings (extra models served next to the default one)
+    DEFAULT_MODEL_NAME: str = os.getenv("DEFAULT_MODEL_NAME", "default")
+    MODEL_REGISTRY: str = os.getenv("MODEL_REGISTRY", "")
+    MODEL_MEMORY_BUDGET_MB: float = float(os.getenv("MODEL_MEMORY_BUDGET_MB", "1024"))
+    
+    # Shadow evaluation settings (candidate model must be in MODEL_REGISTRY)
+    SHADOW_MODEL_NAME: str = os.getenv("SHADOW_MODEL_NAME", "")
+    SHADOW_SAMPLE_RATE: float = float(os.getenv("SHADOW_SAMPLE_RATE", "0.1"))
+    SHADOW_MAX_WORKERS: int = int(os.getenv("SHADOW_MAX_WORKERS", "1"))
+    SHADOW_MAX_PENDING: int = int(os.getenv("SHADOW_MAX_PENDING", "4"))
+    
+    # Drift monitoring settings (fraction of sentences whose tokens are inspected, capped per request)
+    DRIFT_SAMPLE_RATE: float = float(os.getenv("DRIFT_SAMPLE_RATE", "0.1"))
+    DRIFT_MAX_SENTENCES: int = int(os.getenv("DRIFT_MAX_SENTENCES", "16"))
+    
+    # Batch job settings
+    # Off by default: jobs are only scored if a runner (python -m app.worker) is deployed
+    JOBS_ENABLED: bool = os.getenv("JOBS_ENABLED", "false").lower() == "true"
+    JOBS_DIR: str = os.getenv("JOBS_DIR", "jobs")
+    JOBS_DB_PATH: str = os.getenv("JOBS_DB_PATH", "jobs/jobs.db")
+    JOBS_WORKERS: int = int(os.getenv("JOBS_WORKERS", "1"))
+    JOBS_CHUNK_SIZE: int = int(os.getenv("JOBS_CHUNK_SIZE", "1000"))
+    JOBS_CPU_SHARE: float = float(os.getenv("JOBS_CPU_SHARE", "0.25"))
+    JOBS_POLL_INTERVAL_S: float = float(os.getenv("JOBS_POLL_INTERVAL_S", "1.0"))
+    JOBS_NICE: int = int(os.getenv("JOBS_NICE", "10"))
+    JOBS_LEASE_TIMEOUT_S: float = float(os.getenv("JOBS_LEASE_TIMEOUT_S", "60"))
+    JOBS_MAX_UPLOAD_MB: float = float(os.getenv("JOBS_MAX_UPLOAD_MB", "512"))
+    JOBS_METRICS_PORT: int = int(os.getenv("JOBS_METRICS_PORT", "8001"))
+    JOBS_RETENTION_S: float = float(os.getenv("JOBS_RETENTION_S", "604800"))
     
     # Logging settings
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -24,6 +67,22 @@ class Settings(BaseSettings):
     
     # Data settings
     DATA_PATH: str = os.getenv("DATA_PATH", "data/Books_10k.jsonl")
+    
+    @property
+    def warmup_batch_sizes(self) -> List[int]:
+        """Parse WARMUP_BATCH_SIZES into a list of positive batch sizes."""
+        return [int(size) for size in self.WARMUP_BATCH_SIZES.split(",") if size.strip() and int(size) > 0]
+    
+    @property
+    def model_registry_paths(self) -> Dict[str, str]:
+        """Parse MODEL_REGISTRY ("name=path,name=path") into a name to path mapping."""
+        paths = {}
+        for entry in self.MODEL_REGISTRY.split(","):
+            if "=" not in entry:
+                continue
+            name, path = entry.split("=", 1)
+            paths[name.strip()] = path.strip()
+        return paths
 
 # Create global settings object
 settings = Settings()
\ No newline at end of file
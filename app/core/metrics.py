@@ -1,8 +1,227 @@
-from prometheus_client import Histogram
+import glob
+import os
+from contextlib import contextmanager
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, make_asgi_app
+from prometheus_client import multiprocess
+from prometheus_client.mmap_dict import MmapedDict, mmap_key
+
+# Set to a directory to aggregate metrics across gunicorn workers (prometheus multiprocess mode)
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0, 5.0]
+
+REQUEST_COUNT = Counter(
+    'http_requests_total',
+    'Total HTTP requests',
+    ['method', 'endpoint', 'http_status']
+)
 
 REQUEST_LATENCY = Histogram(
     'http_request_latency_seconds',
     'Request latency in seconds',
     ['method', 'endpoint'],
-    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0, 5.0]
-)
\ No newline at end of file
+    buckets=LATENCY_BUCKETS
+)
+
+# Per-model inference metrics (throughput is rate(model_predicted_sentences_total))
+MODEL_INFERENCE_LATENCY = Histogram(
+    'model_inference_latency_seconds',
+    'Model inference latency in seconds',
+    ['model'],
+    buckets=LATENCY_BUCKETS
+)
+
+MODEL_PREDICTED_SENTENCES = Counter(
+    'model_predicted_sentences_total',
+    'Total sentences scored by each model',
+    ['model']
+)
+
+PREDICT_UNIQUE_RATIO = Histogram(
+    'model_predict_unique_ratio',
+    'Fraction of sentences in a prediction request that are unique',
+    ['model'],
+    buckets=[0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0]
+)
+
+PREDICT_SUB_BATCHES = Histogram(
+    'model_predict_sub_batches',
+    'Number of length-bucketed sub-batches a prediction request was split into',
+    ['model'],
+    buckets=[1, 2, 4, 8, 16, 32, 64]
+)
+
+# Model registry metrics
+MODEL_REGISTRY_EVICTIONS = Counter(
+    'model_registry_evictions_total',
+    'Models evicted from the registry to stay within the memory budget',
+    ['model']
+)
+
+MODEL_REGISTRY_MEMORY = Gauge(
+    'model_registry_memory_bytes',
+    'Estimated memory used by models loaded in the registry',
+    # Preloaded models are shared by all workers, so summing would count them once per worker
+    multiprocess_mode='livemax'
+)
+
+# Shadow evaluation metrics (agreement rate = agreements / sentences)
+SHADOW_REQUESTS = Counter(
+    'shadow_requests_total',
+    'Requests offered to the shadow model by outcome (scored, dropped, failed)',
+    ['model', 'outcome']
+)
+
+SHADOW_SENTENCES = Counter(
+    'shadow_sentences_total',
+    'Sentences scored by the shadow model',
+    ['model']
+)
+
+SHADOW_AGREEMENTS = Counter(
+    'shadow_agreements_total',
+    'Sentences where the shadow model agreed with the primary model',
+    ['model']
+)
+
+SHADOW_LABELS = Counter(
+    'shadow_predictions_total',
+    'Shadow model predictions by label',
+    ['model', 'label']
+)
+
+SHADOW_LATENCY = Histogram(
+    'shadow_inference_latency_seconds',
+    'Shadow model inference latency in seconds',
+    ['model'],
+    buckets=LATENCY_BUCKETS
+)
+
+# Input and prediction drift metrics
+MODEL_PREDICTIONS = Counter(
+    'model_predictions_total',
+    'Predictions by model and label',
+    ['model', 'label']
+)
+
+INPUT_SENTENCE_LENGTH = Histogram(
+    'input_sentence_length_words',
+    'Length of sampled input sentences in words',
+    ['model'],
+    buckets=[1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144]
+)
+
+INPUT_TOKENS = Counter(
+    'input_tokens_total',
+    'Tokens in sampled input sentences after the vectorizer analyzer',
+    ['model']
+)
+
+INPUT_OOV_TOKENS = Counter(
+    'input_oov_tokens_total',
+    'Sampled input tokens missing from the model vocabulary',
+    ['model']
+)
+
+# Per-worker sketches; across workers the largest estimate is reported (a lower bound)
+INPUT_DISTINCT_TOKENS = Gauge(
+    'input_distinct_tokens_estimate',
+    'HyperLogLog estimate of distinct tokens in sampled inputs',
+    ['model'],
+    multiprocess_mode='max'
+)
+
+INPUT_OOV_DISTINCT_TOKENS = Gauge(
+    'input_oov_distinct_tokens_estimate',
+    'HyperLogLog estimate of distinct out-of-vocabulary tokens in sampled inputs',
+    ['model'],
+    multiprocess_mode='max'
+)
+
+
+# Batch job metrics
+BATCH_JOBS = Counter(
+    'batch_jobs_total',
+    'Batch scoring jobs by status transition (queued, completed, failed)',
+    ['status']
+)
+
+BATCH_JOB_SENTENCES = Counter(
+    'batch_job_sentences_total',
+    'Sentences scored by batch jobs',
+    ['model']
+)
+
+@contextmanager
+def multiprocess_dir_lock(path: str, shared: bool):
+    """
+    Lock the multiprocess directory against concurrent compaction.
+
+    Scrapes take a shared lock and compaction an exclusive one. Metric updates
+    on the request path never take this lock.
+    """
+    import fcntl
+    with open(os.path.join(path, ".lock"), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+class LockedMultiProcessCollector(multiprocess.MultiProcessCollector):
+    """MultiProcessCollector that never reads the directory halfway through a compaction."""
+
+    def collect(self):
+        with multiprocess_dir_lock(self._path, shared=True):
+            return list(super().collect())
+
+def make_metrics_app():
+    """
+    Create the ASGI app serving /metrics.
+
+    In multiprocess mode the per-worker metric files are aggregated on every
+    scrape, so any worker returns the totals for all workers.
+    """
+    path = os.environ.get(MULTIPROC_DIR_ENV)
+    if not path:
+        return make_asgi_app()
+    registry = CollectorRegistry()
+    LockedMultiProcessCollector(registry, path=path)
+    return make_asgi_app(registry=registry)
+
+def compact_dead_worker(pid: int, path: str) -> None:
+    """
+    Clean up the metric files of a dead worker.
+
+    Live gauges of the worker are dropped. Its counters and histograms are
+    merged into per-type archive files so totals are kept while the number of
+    files read on each scrape stays bounded as workers are replaced.
+
+    Args:
+        pid: Process ID of the dead worker.
+        path: Multiprocess metrics directory.
+    """
+    with multiprocess_dir_lock(path, shared=False):
+        multiprocess.mark_process_dead(pid, path)
+        for typ in ("counter", "histogram", "summary"):
+            worker_file = os.path.join(path, f"{typ}_{pid}.db")
+            if not os.path.exists(worker_file):
+                continue
+            archive_file = os.path.join(path, f"{typ}_archive.db")
+            files = [worker_file] + ([archive_file] if os.path.exists(archive_file) else [])
+            merged = multiprocess.MultiProcessCollector.merge(files, accumulate=False)
+
+            tmp_file = archive_file + ".tmp"
+            archive = MmapedDict(tmp_file)
+            for metric in merged:
+                for sample in metric.samples:
+                    key = mmap_key(
+                        metric.name, sample.name, list(sample.labels), list(sample.labels.values()), metric.documentation
+                    )
+                    archive.write_value(key, sample.value, 0)
+            archive.close()
+            os.replace(tmp_file, archive_file)
+            os.remove(worker_file)
+        # Non-live gauges of a dead worker describe state that no longer exists
+        for gauge_file in glob.glob(os.path.join(path, f"gauge_*_{pid}.db")):
+            os.remove(gauge_file)
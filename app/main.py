@@ -1,30 +1,20 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import RedirectResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from prometheus_client import make_asgi_app, Counter, Histogram
 from starlette.middleware.base import BaseHTTPMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 from app.core.config import settings
 from app.core.logging import LoggerMiddleware, logger
+from app.core.metrics import REQUEST_COUNT, REQUEST_LATENCY, make_metrics_app
 from app.api.routes import router
 from app.services.singleton import load_model
 from app.services.model_service import ModelService
+from app.services.jobs import JobQueue
+from app.services.registry import get_model_registry
+from app.services.shadow import ShadowEvaluator
 from fastapi.routing import APIRoute
 
-# Prometheus metrics
-REQUEST_COUNT = Counter(
-    "http_requests_total",
-    "Total HTTP requests",
-    ["method", "endpoint", "http_status"]
-)
-
-REQUEST_LATENCY = Histogram(
-    "http_request_latency_seconds",
-    "HTTP request latency",
-    ["method", "endpoint"],
-    buckets=[0.1, 0.3, 0.5, 1, 2, 5]
-)
-
 class MetricsMiddleware(BaseHTTPMiddleware):
     """Middleware to collect Prometheus metrics for each request."""
     async def dispatch(self, request, call_next):
@@ -63,17 +53,66 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         
         return response
 
+async def warm_up_and_mark_ready(app: FastAPI) -> None:
+    """
+    Warm the default model up in a worker thread, then mark the service ready.
+
+    Runs as a task after startup: servers only accept connections once the
+    lifespan startup has finished, so warming up inside it would mean `/ready`
+    could never be observed returning 503.
+    """
+    try:
+        if settings.WARMUP_ENABLED:
+            await asyncio.to_thread(
+                app.state.model_service.warm_up, settings.warmup_batch_sizes, settings.WARMUP_ROUNDS
+            )
+    except Exception as e:
+        logger.error(f"Model warm-up failed, service stays not ready: {str(e)}")
+        return
+    app.state.ready = True
+    logger.info("Application is ready")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown tasks."""
     logger.info("Starting up the application")
-    # Load model into singleton
+    # Not ready until the model is loaded and warmed up
+    app.state.ready = False
+    # Load model into singleton (no-op if already preloaded in the gunicorn master)
     load_model(settings.MODEL_PATH)
     # Create model service that uses the singleton
     app.state.model_service = ModelService()
+    # Additional named models, loaded within the memory budget and evicted LRU
+    # (preload is a no-op if already done in the gunicorn master)
+    app.state.model_registry = get_model_registry()
+    app.state.model_registry.preload()
+    # Optional candidate model scored on a sample of live traffic
+    app.state.shadow_evaluator = None
+    if settings.SHADOW_MODEL_NAME:
+        if settings.SHADOW_MODEL_NAME in settings.model_registry_paths:
+            app.state.shadow_evaluator = ShadowEvaluator(
+                app.state.model_registry,
+                settings.SHADOW_MODEL_NAME,
+                sample_rate=settings.SHADOW_SAMPLE_RATE,
+                max_workers=settings.SHADOW_MAX_WORKERS,
+                max_pending=settings.SHADOW_MAX_PENDING
+            )
+            logger.info(f"Shadow evaluation enabled for model '{settings.SHADOW_MODEL_NAME}'")
+        else:
+            logger.warning(f"Shadow model '{settings.SHADOW_MODEL_NAME}' is not in MODEL_REGISTRY, shadow evaluation disabled")
+    # Batch job queue shared by all workers; jobs are scored by the separate runner (app.worker)
+    app.state.job_queue = None
+    if settings.JOBS_ENABLED:
+        app.state.job_queue = JobQueue(settings.JOBS_DB_PATH, settings.JOBS_DIR, lease_timeout=settings.JOBS_LEASE_TIMEOUT_S)
+    # Warm up in the background; /ready reports 503 until it has finished
+    warmup_task = asyncio.create_task(warm_up_and_mark_ready(app))
     logger.info("Application startup complete")
     yield
     logger.info("Shutting down the application")
+    app.state.ready = False
+    warmup_task.cancel()
+    if app.state.shadow_evaluator is not None:
+        app.state.shadow_evaluator.shutdown()
 
 # Create FastAPI application
 app = FastAPI(
@@ -111,6 +150,13 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+@app.get("/ready", tags=["health"])
+async def readiness_check():
+    """Readiness endpoint: only reports ready once the model is loaded and warmed up."""
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
+
 @app.get("/status", tags=["status"])
 async def status_endpoint():
     """Check the status of the application."""
@@ -126,8 +172,8 @@ async def status_endpoint():
 async def runtime_error_handler(request: Request, exc: RuntimeError):
     return JSONResponse(status_code=500, content={"detail": str(exc)})
 
-# Expose Prometheus metrics endpoint
-metrics_app = make_asgi_app()
+# Expose Prometheus metrics endpoint (aggregated across workers in multiprocess mode)
+metrics_app = make_metrics_app()
 app.mount("/metrics", metrics_app, name="metrics")
 
 if __name__ == "__main__":
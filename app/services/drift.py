@@ -0,0 +1,156 @@
+import hashlib
+import math
+import random
+import time
+from collections import Counter
+from typing import Any, Iterable, List, Optional
+from app.core.metrics import (
+    INPUT_DISTINCT_TOKENS,
+    INPUT_OOV_DISTINCT_TOKENS,
+    INPUT_OOV_TOKENS,
+    INPUT_SENTENCE_LENGTH,
+    INPUT_TOKENS,
+    MODEL_PREDICTIONS,
+)
+
+# Minimum seconds between recomputing the HyperLogLog estimates for the gauges
+ESTIMATE_REFRESH_SECONDS = 5.0
+
+class HyperLogLog:
+    """
+    Constant-memory estimate of the number of distinct items seen.
+
+    Uses 2**precision one-byte registers; the default of 12 takes 4KB and has
+    a standard error of about 1.6%. Items are hashed with a fixed 64-bit
+    blake2b digest, so sketches are reproducible across processes.
+    """
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = bytearray(self.num_registers)
+        self._rank_bits = 64 - precision
+        self._rank_mask = (1 << self._rank_bits) - 1
+        self._alpha = 0.7213 / (1 + 1.079 / self.num_registers)
+
+    def add(self, item: str) -> None:
+        """Add an item to the sketch."""
+        h = int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big")
+        index = h >> self._rank_bits
+        rank = self._rank_bits - (h & self._rank_mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, items: Iterable[str]) -> None:
+        """Add several items to the sketch."""
+        for item in items:
+            self.add(item)
+
+    def count(self) -> float:
+        """Estimate the number of distinct items added so far."""
+        m = self.num_registers
+        estimate = self._alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        if estimate <= 2.5 * m:
+            zeros = self.registers.count(0)
+            if zeros:
+                # Small-range correction (linear counting)
+                return m * math.log(m / zeros)
+        return estimate
+
+def find_vectorizer(model: Any) -> Optional[Any]:
+    """
+    Find the fitted text vectorizer (e.g. TfidfVectorizer) in a model pipeline.
+
+    Returns:
+        The vectorizer step, or None if the model is not a pipeline with one.
+    """
+    steps = getattr(model, "steps", None)
+    if not isinstance(steps, list):
+        return None
+    for _, step in steps:
+        if hasattr(step, "vocabulary_") and hasattr(step, "build_analyzer"):
+            return step
+    return None
+
+class DriftMonitor:
+    """
+    Streaming, constant-memory sketches of model inputs and outputs.
+
+    Prediction labels are counted for every request. Token-level statistics
+    (sentence length, out-of-vocabulary rate, distinct token estimates) are
+    computed for a random `sample_rate` fraction of sentences, capped at
+    `max_sentences` per request, so a large batch never pays for more than a
+    few analyzer calls.
+    """
+
+    def __init__(self, model: Any, model_name: str, sample_rate: float, max_sentences: int = 16):
+        """
+        Initialize the drift monitor.
+
+        Args:
+            model: Served model; its vectorizer vocabulary is used for OOV tracking.
+            model_name: Model name used to label metrics.
+            sample_rate: Fraction of sentences (0-1) whose tokens are inspected.
+            max_sentences: Maximum sentences inspected per request.
+        """
+        self.model_name = model_name
+        self.sample_rate = sample_rate
+        self.max_sentences = max_sentences
+        vectorizer = find_vectorizer(model)
+        self.vocabulary = vectorizer.vocabulary_ if vectorizer is not None else None
+        self.analyzer = vectorizer.build_analyzer() if vectorizer is not None else None
+        self.distinct_tokens = HyperLogLog()
+        self.oov_distinct_tokens = HyperLogLog()
+        self._last_refresh = float("-inf")
+
+    def sample(self, sentences: List[str]) -> List[str]:
+        """
+        Pick the sentences of a batch whose tokens are inspected.
+
+        Each sentence is inspected with probability `sample_rate` on average
+        (rounded randomly, so single-sentence requests are sampled too), and
+        at most `max_sentences` are picked.
+        """
+        expected = len(sentences) * self.sample_rate
+        num_sampled = int(expected) + (random.random() < expected - int(expected))
+        num_sampled = min(num_sampled, self.max_sentences, len(sentences))
+        return random.sample(sentences, num_sampled) if num_sampled > 0 else []
+
+    def observe(self, sentences: List[str], predictions: List[str]) -> None:
+        """
+        Update the sketches with a scored batch.
+
+        Args:
+            sentences: Input sentences.
+            predictions: Labels predicted for the sentences.
+        """
+        for label, count in Counter(predictions).items():
+            MODEL_PREDICTIONS.labels(model=self.model_name, label=label).inc(count)
+
+        sentences = self.sample(sentences)
+        if not sentences:
+            return
+        length_histogram = INPUT_SENTENCE_LENGTH.labels(model=self.model_name)
+        for sentence in sentences:
+            length_histogram.observe(len(sentence.split()))
+
+        if self.analyzer is None:
+            return
+        num_tokens = 0
+        num_oov = 0
+        for sentence in sentences:
+            tokens = self.analyzer(sentence)
+            num_tokens += len(tokens)
+            self.distinct_tokens.update(tokens)
+            oov_tokens = [token for token in tokens if token not in self.vocabulary]
+            num_oov += len(oov_tokens)
+            self.oov_distinct_tokens.update(oov_tokens)
+        INPUT_TOKENS.labels(model=self.model_name).inc(num_tokens)
+        INPUT_OOV_TOKENS.labels(model=self.model_name).inc(num_oov)
+
+        # Estimates are throttled: computing one walks every register
+        now = time.monotonic()
+        if now - self._last_refresh >= ESTIMATE_REFRESH_SECONDS:
+            self._last_refresh = now
+            INPUT_DISTINCT_TOKENS.labels(model=self.model_name).set(self.distinct_tokens.count())
+            INPUT_OOV_DISTINCT_TOKENS.labels(model=self.model_name).set(self.oov_distinct_tokens.count())
@@ -0,0 +1,352 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+from app.core.logging import logger
+from app.core.metrics import BATCH_JOB_SENTENCES, BATCH_JOBS
+from app.services.model_service import ModelService
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    model TEXT,
+    input_path TEXT NOT NULL,
+    result_path TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    owner TEXT,
+    heartbeat_at REAL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+)
+"""
+
+def _remove_files(paths: Iterable[str]) -> None:
+    """Remove job files, ignoring ones that are already gone."""
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+class JobQueue:
+    """
+    Queue of batch scoring jobs stored in a local SQLite database.
+
+    The database and job files live on local disk, so every worker process of
+    the service can submit, claim and report on jobs without an external broker.
+
+    A claimed job is leased: the claim gets a random owner token and a
+    heartbeat that the owner refreshes after every chunk. Jobs whose heartbeat
+    is older than `lease_timeout` (e.g. their process crashed or was killed
+    mid-chunk) are requeued by the next claim. Updates from an owner whose
+    lease was taken over are ignored.
+    """
+
+    def __init__(self, db_path: str, jobs_dir: str, lease_timeout: float = 60.0):
+        """
+        Initialize the queue, creating the database and job directory if needed.
+
+        Args:
+            db_path: Path to the SQLite database file.
+            jobs_dir: Directory for uploaded inputs and result files.
+            lease_timeout: Seconds without a heartbeat after which a running job is requeued.
+        """
+        self.db_path = db_path
+        self.lease_timeout = lease_timeout
+        self.jobs_dir = Path(jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode; transactions are explicit."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def new_job_paths(self) -> Dict[str, str]:
+        """Allocate a job ID and the paths of its input and result files."""
+        job_id = uuid.uuid4().hex
+        return {
+            "id": job_id,
+            "input_path": str(self.jobs_dir / f"{job_id}.input.txt"),
+            "result_path": str(self.jobs_dir / f"{job_id}.result.txt"),
+        }
+
+    def submit(self, job_id: str, input_path: str, result_path: str, total: int, model_name: Optional[str] = None) -> None:
+        """
+        Queue a job whose input file has been written.
+
+        Args:
+            job_id: Job ID from new_job_paths.
+            input_path: Input file with one sentence per line.
+            result_path: Where the predictions will be written.
+            total: Number of sentences in the input file.
+            model_name: Registry model to score with; None for the default model.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, model, input_path, result_path, total, created_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, model_name, input_path, result_path, total, time.time())
+            )
+        BATCH_JOBS.labels(status="queued").inc()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job by ID, or None if it does not exist."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Atomically claim the oldest queued job, first requeueing expired leases.
+
+        Returns:
+            The claimed job with its new `owner` token, or None if no job is queued.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            expired = conn.execute(
+                "UPDATE jobs SET status = 'queued', processed = 0, owner = NULL, heartbeat_at = NULL, started_at = NULL "
+                "WHERE status = 'running' AND heartbeat_at < ?",
+                (now - self.lease_timeout,)
+            ).rowcount
+            if expired:
+                logger.warning(f"Requeued {expired} batch jobs with expired leases")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            owner = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, heartbeat_at = ?, started_at = ? WHERE id = ?",
+                (owner, now, now, row["id"])
+            )
+            conn.execute("COMMIT")
+        job = dict(row)
+        job.update(status="running", owner=owner, heartbeat_at=now, started_at=now)
+        return job
+
+    def update_progress(self, job_id: str, owner: str, processed: int) -> bool:
+        """
+        Record how many sentences of a job have been scored and renew its lease.
+
+        Returns:
+            False if the lease was lost to another claim and the owner must stop.
+        """
+        with closing(self._connect()) as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET processed = ?, heartbeat_at = ? WHERE id = ? AND owner = ? AND status = 'running'",
+                (processed, time.time(), job_id, owner)
+            ).rowcount
+        return updated == 1
+
+    def requeue(self, job_id: str, owner: str) -> None:
+        """Put a running job back in the queue to be restarted from the beginning."""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', processed = 0, owner = NULL, heartbeat_at = NULL, started_at = NULL "
+                "WHERE id = ? AND owner = ? AND status = 'running'",
+                (job_id, owner)
+            )
+
+    def finish(self, job_id: str, owner: str, status: str, error: Optional[str] = None) -> bool:
+        """
+        Mark a job as completed or failed and remove its input file, which is
+        only needed to (re)score the job.
+
+        Returns:
+            False if the lease was lost to another claim and the job was left as is.
+        """
+        with closing(self._connect()) as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND owner = ? AND status = 'running'",
+                (status, error, time.time(), job_id, owner)
+            ).rowcount
+            row = conn.execute("SELECT input_path FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if not updated:
+            return False
+        BATCH_JOBS.labels(status=status).inc()
+        _remove_files([row["input_path"]])
+        return True
+
+    def delete(self, job_id: str) -> bool:
+        """
+        Delete a job that is not running, with its input and result files.
+
+        Returns:
+            False if the job does not exist or is running.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT input_path, result_path FROM jobs WHERE id = ? AND status != 'running'", (job_id,)
+            ).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            conn.execute("COMMIT")
+        if row is None:
+            return False
+        _remove_files([row["input_path"], row["result_path"]])
+        return True
+
+    def purge_finished(self, retention: float) -> int:
+        """
+        Delete completed and failed jobs, and their files, finished more than `retention` seconds ago.
+
+        Returns:
+            Number of jobs deleted.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, input_path, result_path FROM jobs "
+                "WHERE status IN ('completed', 'failed') AND finished_at < ?",
+                (time.time() - retention,)
+            ).fetchall()
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(row["id"],) for row in rows])
+            conn.execute("COMMIT")
+        for row in rows:
+            _remove_files([row["input_path"], row["result_path"]])
+        if rows:
+            logger.info(f"Purged {len(rows)} finished batch jobs")
+        return len(rows)
+
+class JobWorkerPool:
+    """
+    Background threads that score queued jobs in chunks.
+
+    Each thread sleeps after every chunk so that batch work uses at most
+    `cpu_share` of a core. The pool runs in the dedicated, reniced job runner
+    process (`python -m app.worker`), never next to the API's event loop.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        get_service: Callable[[Optional[str]], ModelService],
+        workers: int = 1,
+        chunk_size: int = 1000,
+        cpu_share: float = 0.25,
+        poll_interval: float = 1.0
+    ):
+        """
+        Initialize the worker pool.
+
+        Args:
+            queue: Job queue to claim jobs from.
+            get_service: Returns the ModelService for a model name (None for the default model).
+            workers: Number of worker threads.
+            chunk_size: Sentences scored per model call.
+            cpu_share: Fraction (0-1] of wall time each thread may spend scoring.
+            poll_interval: Seconds to wait between polls when the queue is empty.
+        """
+        self.queue = queue
+        self.get_service = get_service
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.cpu_share = cpu_share
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self) -> "JobWorkerPool":
+        """Start the worker threads."""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"batch-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Signal the worker threads to stop and wait for them."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def _run(self) -> None:
+        """Worker loop: process jobs until stopped."""
+        while not self._stop.is_set():
+            if not self.run_next():
+                self._stop.wait(self.poll_interval)
+
+    def run_next(self) -> bool:
+        """
+        Claim and process one queued job.
+
+        Returns:
+            True if a job was processed, False if the queue was empty.
+        """
+        job = self.queue.claim()
+        if job is None:
+            return False
+        logger.info(f"Starting batch job {job['id']} ({job['total']} sentences)")
+        try:
+            self._process(job)
+        except Exception as e:
+            logger.error(f"Batch job {job['id']} failed: {str(e)}")
+            self.queue.finish(job["id"], job["owner"], "failed", error=str(e))
+        return True
+
+    def _process(self, job: Dict[str, Any]) -> None:
+        """Score a job's input file, then publish the result file and mark the job completed."""
+        service = self.get_service(job["model"])
+        # One temporary file per claim, so a stale owner never writes into a new owner's file
+        tmp_path = f"{job['result_path']}.{job['owner']}.tmp"
+        try:
+            outcome = self._score_file(job, service, tmp_path)
+            if outcome == "completed":
+                os.replace(tmp_path, job["result_path"])
+                self.queue.finish(job["id"], job["owner"], "completed")
+                logger.info(f"Finished batch job {job['id']}")
+        finally:
+            # Partial results of failed, interrupted or taken-over jobs are discarded
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _score_file(self, job: Dict[str, Any], service: ModelService, tmp_path: str) -> str:
+        """
+        Score a job's input file chunk by chunk into `tmp_path`.
+
+        Returns:
+            "completed", "interrupted" (the pool is stopping; the job is requeued)
+            or "lost" (the lease was taken over by another claim).
+        """
+        processed = 0
+        source = open(job["input_path"], encoding="utf-8", errors="replace", newline="\n")
+        with source, open(tmp_path, "w", encoding="utf-8") as result:
+            while not self._stop.is_set():
+                chunk = [line.rstrip("\r\n") for _, line in zip(range(self.chunk_size), source)]
+                if not chunk:
+                    return "completed"
+                start_time = time.time()
+                predictions = service.predict(chunk, record_metrics=False)
+                result.write("\n".join(predictions) + "\n")
+                processed += len(chunk)
+                BATCH_JOB_SENTENCES.labels(model=service.name).inc(len(chunk))
+                if not self.queue.update_progress(job["id"], job["owner"], processed):
+                    logger.warning(f"Batch job {job['id']} lease lost after {processed} sentences, stopping")
+                    return "lost"
+                # Duty-cycle throttle: busy for `elapsed`, idle long enough to stay within cpu_share
+                elapsed = time.time() - start_time
+                if self.cpu_share < 1.0:
+                    self._stop.wait(elapsed * (1.0 - self.cpu_share) / self.cpu_share)
+        # Stopping mid-job: hand it back to the queue to be restarted
+        logger.info(f"Batch job {job['id']} interrupted after {processed} sentences, requeueing")
+        self.queue.requeue(job["id"], job["owner"])
+        return "interrupted"
@@ -1,21 +1,104 @@
+import time
 from fastapi import Request
-from typing import List
+from typing import Any, List, Optional
+from app.core.config import settings
 from app.core.logging import logger
+from app.core.metrics import (
+    MODEL_INFERENCE_LATENCY,
+    MODEL_PREDICTED_SENTENCES,
+    PREDICT_SUB_BATCHES,
+    PREDICT_UNIQUE_RATIO,
+)
+from app.services.drift import DriftMonitor
 from app.services.singleton import get_model
+from app.services.vectorizer import CachedPipeline
+
+# Representative Books review sentences used to warm the model up before serving
+WARMUP_SENTENCES = [
+    "This book was absolutely wonderful and I could not put it down.",
+    "The plot dragged in the middle but the ending made up for it.",
+    "It was okay.",
+    "Terrible writing, flat characters and a predictable story.",
+    "I would recommend this to anyone who enjoys historical fiction.",
+    "The author clearly did a lot of research, but the pacing is uneven.",
+    "Five stars.",
+    "Not what I expected from the description on the back cover.",
+]
+
+def warmup_sentence(i: int) -> str:
+    """
+    Build the i-th warm-up sentence by joining the WARMUP_SENTENCES picked by
+    the base-len(WARMUP_SENTENCES) digits of i. Every i gives a different
+    sentence, so warm-up batches of any size are not collapsed by deduplication.
+    """
+    n = len(WARMUP_SENTENCES)
+    parts = [WARMUP_SENTENCES[i % n]]
+    i //= n
+    while i:
+        parts.append(WARMUP_SENTENCES[i % n])
+        i //= n
+    return " ".join(parts)
+
+def length_bucketed_batches(sentences: List[str], max_chars: int) -> List[List[str]]:
+    """
+    Split sentences into sub-batches of similar length.
+
+    Batches within `max_chars` are returned whole. Larger ones are sorted by
+    length and cut greedily so that each sub-batch holds at most `max_chars`
+    characters (a single longer sentence gets a sub-batch of its own), which
+    bounds the size of each sub-batch's sparse matrix.
+
+    Args:
+        sentences: Sentences to split.
+        max_chars: Character budget per sub-batch; 0 or less disables splitting.
+
+    Returns:
+        List of sub-batches covering every sentence exactly once.
+    """
+    if max_chars <= 0 or sum(len(sentence) for sentence in sentences) <= max_chars:
+        return [sentences]
+    sub_batches = []
+    current = []
+    current_chars = 0
+    for sentence in sorted(sentences, key=len):
+        if current and current_chars + len(sentence) > max_chars:
+            sub_batches.append(current)
+            current = []
+            current_chars = 0
+        current.append(sentence)
+        current_chars += len(sentence)
+    if current:
+        sub_batches.append(current)
+    return sub_batches
 
 class ModelService:
     """Service for handling model predictions."""
     
-    def __init__(self):
-        """Initialize the model service using the singleton model."""
-        self.model = get_model()
+    def __init__(self, model: Optional[Any] = None, name: str = settings.DEFAULT_MODEL_NAME):
+        """
+        Initialize the model service.
+        
+        Args:
+            model: Loaded model to serve; defaults to the singleton model.
+            name: Model name used to label per-model metrics.
+        """
+        self.model = model if model is not None else get_model()
+        self.name = name
+        self.drift = DriftMonitor(self.model, name, settings.DRIFT_SAMPLE_RATE, settings.DRIFT_MAX_SENTENCES)
+        # Cached TF-IDF transform for supported pipelines, None otherwise
+        self.cached_pipeline = CachedPipeline.from_model(self.model, settings.VECTORIZER_CACHE_SIZE)
 
-    def predict(self, sentences: List[str]) -> List[str]:
+    def predict(self, sentences: List[str], record_metrics: bool = True) -> List[str]:
         """
         Predict sentiment for a list of sentences.
+
+        Duplicate sentences are scored once and, if PREDICT_SUB_BATCH_CHARS is
+        set, large batches are split into length-bucketed sub-batches (see
+        `length_bucketed_batches`); results are returned in input order.
         
         Args:
             sentences: List of sentences to analyze.
+            record_metrics: Record latency, throughput and drift metrics (disabled for warm-up).
         
         Returns:
             List of sentiment predictions.
@@ -24,15 +107,84 @@ class ModelService:
         if not sentences:
             return []
         try:
-            predictions = self.model.predict(sentences)
-            # If predictions is a numpy array convert it to list; if already a list, return as-is.
-            if hasattr(predictions, "tolist"):
-                return predictions.tolist()
-            return predictions
+            start_time = time.time()
+            # Score each distinct sentence once (in length-bucketed sub-batches if configured)
+            unique_sentences = list(dict.fromkeys(sentences))
+            sub_batches = length_bucketed_batches(unique_sentences, settings.PREDICT_SUB_BATCH_CHARS)
+            labels = {}
+            for sub_batch in sub_batches:
+                labels.update(zip(sub_batch, self._predict_batch(sub_batch)))
+            # Scatter the labels back to the input order, duplicates included
+            predictions = [labels[sentence] for sentence in sentences]
+            inference_time = time.time() - start_time
         except Exception as e:
             logger.error(f"Prediction error: {str(e)}")
             raise RuntimeError(f"Prediction failed: {str(e)}")
+        if record_metrics:
+            MODEL_INFERENCE_LATENCY.labels(model=self.name).observe(inference_time)
+            MODEL_PREDICTED_SENTENCES.labels(model=self.name).inc(len(sentences))
+            PREDICT_UNIQUE_RATIO.labels(model=self.name).observe(len(unique_sentences) / len(sentences))
+            PREDICT_SUB_BATCHES.labels(model=self.name).observe(len(sub_batches))
+            # Monitoring must never fail a prediction that succeeded
+            try:
+                self.drift.observe(sentences, predictions)
+            except Exception as e:
+                logger.error(f"Drift monitoring error: {str(e)}")
+        return predictions
+
+    def _predict_batch(self, sentences: List[str]) -> List[str]:
+        """Run the model on a batch of sentences and return the labels as a list."""
+        if self.cached_pipeline is not None and self.cached_pipeline.pipeline is self.model:
+            predictions = self.cached_pipeline.predict(sentences)
+        else:
+            predictions = self.model.predict(sentences)
+        # If predictions is a numpy array convert it to list; if already a list, use as-is.
+        if hasattr(predictions, "tolist"):
+            predictions = predictions.tolist()
+        return predictions
+
+    def warm_up(self, batch_sizes: List[int], rounds: int = 1) -> float:
+        """
+        Run representative batches through the model to pay first-call costs
+        (lazy allocations, cold caches) before real traffic arrives.
+        
+        Args:
+            batch_sizes: Batch sizes to exercise, e.g. [1, 8, 64].
+            rounds: Number of passes over all batch sizes.
+        
+        Returns:
+            Total warm-up time in milliseconds.
+        """
+        start_time = time.time()
+        for _ in range(rounds):
+            for batch_size in batch_sizes:
+                batch = [warmup_sentence(i) for i in range(batch_size)]
+                self.predict(batch, record_metrics=False)
+        warmup_time_ms = (time.time() - start_time) * 1000
+        logger.info(f"Model warm-up finished: batch sizes {batch_sizes} x {rounds} rounds in {warmup_time_ms:.2f}ms")
+        return warmup_time_ms
+
+def resolve_model_service(state: Any, model_name: Optional[str] = None) -> ModelService:
+    """
+    Get the ModelService for a model from app state.
+    
+    Args:
+        state: Application state holding the default service and the registry.
+        model_name: Registry model name; None or the default name selects the default model.
+    
+    Returns:
+        The ModelService serving the requested model.
+    
+    Raises:
+        KeyError: If the model name is not registered.
+    """
+    if model_name is None or model_name == settings.DEFAULT_MODEL_NAME:
+        return state.model_service
+    registry = getattr(state, "model_registry", None)
+    if registry is None:
+        raise KeyError(f"Unknown model: {model_name}")
+    return registry.get(model_name)
 
-def get_model_service(request: Request) -> ModelService:
-    """Get the ModelService instance from app state."""
-    return request.app.state.model_service
\ No newline at end of file
+def get_model_service(request: Request, model_name: Optional[str] = None) -> ModelService:
+    """Get the ModelService for a model from the request's app state."""
+    return resolve_model_service(request.app.state, model_name)
@@ -0,0 +1,179 @@
+import gc
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from types import FunctionType, ModuleType
+from typing import Any, Dict, List, Tuple
+import joblib
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import MODEL_REGISTRY_EVICTIONS, MODEL_REGISTRY_MEMORY
+from app.services.model_service import ModelService
+
+def estimate_memory_bytes(obj: Any) -> int:
+    """
+    Estimate the in-memory size of an object graph, such as a loaded pipeline.
+
+    Sums `sys.getsizeof` over every object reachable from `obj` (each counted
+    once), which covers vocabulary dicts and their strings as well as numpy
+    array buffers. Classes, modules and functions are shared and not counted.
+    """
+    seen = set()
+    pending = [obj]
+    total = 0
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, (type, ModuleType, FunctionType)):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        pending.extend(gc.get_referents(item))
+    return total
+
+class ModelRegistry:
+    """
+    Registry of named model artifacts served next to the default model.
+
+    Models are loaded on first use and kept in least-recently-used order. When
+    a loaded model would exceed the memory budget, the least recently used
+    models are evicted first. A model's memory footprint is measured after
+    loading (see `estimate_memory_bytes`).
+
+    Artifacts are loaded outside the registry lock, so lookups of models that
+    are already loaded never wait for a load; concurrent requests for the
+    same model share a single load.
+    """
+
+    def __init__(self, model_paths: Dict[str, str], memory_budget_bytes: int):
+        """
+        Initialize the registry.
+
+        Args:
+            model_paths: Mapping of model name (e.g. "books", "books-v2") to artifact path.
+            memory_budget_bytes: Maximum estimated memory for loaded models.
+        """
+        self.model_paths = dict(model_paths)
+        self.memory_budget_bytes = memory_budget_bytes
+        self._services: "OrderedDict[str, ModelService]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._loading: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._preloaded = False
+
+    @property
+    def memory_used_bytes(self) -> int:
+        """Estimated memory used by the currently loaded models."""
+        return sum(self._sizes.values())
+
+    def names(self) -> List[str]:
+        """Names of all registered models."""
+        return list(self.model_paths)
+
+    def loaded(self) -> List[str]:
+        """Names of loaded models, least recently used first."""
+        return list(self._services)
+
+    def get(self, name: str) -> ModelService:
+        """
+        Get the ModelService for a registered model, loading it if needed.
+
+        Args:
+            name: Registered model name.
+
+        Returns:
+            ModelService serving the model.
+
+        Raises:
+            KeyError: If the model name is not registered.
+        """
+        with self._lock:
+            if name in self._services:
+                self._services.move_to_end(name)
+                return self._services[name]
+            if name not in self.model_paths:
+                raise KeyError(f"Unknown model: {name}")
+            future = self._loading.get(name)
+            if future is None:
+                future = self._loading[name] = Future()
+                loader = True
+            else:
+                loader = False
+        if not loader:
+            # Another thread is loading this model; wait for its result
+            return future.result()
+        try:
+            service, size = self._load(name)
+            with self._lock:
+                self._insert(name, service, size)
+            future.set_result(service)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(name, None)
+        return service
+
+    def preload(self) -> List[str]:
+        """
+        Load registered models in order until the memory budget is reached.
+        Only the first call loads anything, so workers forked from a process
+        that already preloaded reuse its models.
+
+        Returns:
+            Names of the models that were loaded.
+        """
+        if self._preloaded:
+            # Forked workers report the inherited models under their own process
+            MODEL_REGISTRY_MEMORY.set(self.memory_used_bytes)
+            return []
+        self._preloaded = True
+        preloaded = []
+        for name in self.model_paths:
+            service, size = self._load(name)
+            with self._lock:
+                if self.memory_used_bytes + size > self.memory_budget_bytes:
+                    logger.info(f"Skipping preload of model '{name}': memory budget reached")
+                    break
+                self._insert(name, service, size)
+            preloaded.append(name)
+        return preloaded
+
+    def _load(self, name: str) -> Tuple[ModelService, int]:
+        """Load a model and measure its memory footprint. Runs without the lock."""
+        path = self.model_paths[name]
+        logger.info(f"Loading model '{name}' from {path}")
+        model = joblib.load(path)
+        size = estimate_memory_bytes(model)
+        if size > self.memory_budget_bytes:
+            logger.warning(f"Model '{name}' ({size} bytes) exceeds the registry memory budget on its own")
+        return ModelService(model=model, name=name), size
+
+    def _insert(self, name: str, service: ModelService, size: int) -> None:
+        """Add a loaded model, evicting least recently used models to fit the budget. Caller holds the lock."""
+        while self._services and self.memory_used_bytes + size > self.memory_budget_bytes:
+            evicted, _ = self._services.popitem(last=False)
+            self._sizes.pop(evicted)
+            MODEL_REGISTRY_EVICTIONS.labels(model=evicted).inc()
+            logger.info(f"Evicted model '{evicted}' from registry")
+        self._services[name] = service
+        self._sizes[name] = size
+        MODEL_REGISTRY_MEMORY.set(self.memory_used_bytes)
+
+_registry = None
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Get the process-wide registry of the models in settings, creating it on first use.
+
+    Under gunicorn it is created and preloaded in the master, so the preloaded
+    models are shared copy-on-write by all forked workers like the default model.
+    """
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry(
+            settings.model_registry_paths,
+            memory_budget_bytes=int(settings.MODEL_MEMORY_BUDGET_MB * 1024 * 1024)
+        )
+    return _registry
@@ -0,0 +1,56 @@
+import re
+from functools import lru_cache
+from typing import Callable, List
+from app.core.logging import logger
+
+# Fallback: split after sentence-ending punctuation followed by whitespace
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+def regex_split(text: str) -> List[str]:
+    """
+    Split text into sentences on terminal punctuation.
+    
+    Args:
+        text: Text to split.
+    
+    Returns:
+        Non-empty, stripped sentences.
+    """
+    return [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+@lru_cache(maxsize=None)
+def get_sentence_splitter(language: str = "english") -> Callable[[str], List[str]]:
+    """
+    Get a sentence splitter, loading the Punkt model only once per process.
+    
+    Uses the same Punkt tokenizer as `nltk.sent_tokenize` in the training
+    pipeline, so served documents are split like the training data. Falls back
+    to a regex splitter if the NLTK punkt_tab data is not installed (the Docker
+    image installs it) or NLTK is older than 3.9.
+    
+    Args:
+        language: Punkt model language.
+    
+    Returns:
+        Function splitting a text into a list of sentences.
+    """
+    try:
+        from nltk.tokenize import PunktTokenizer
+        return PunktTokenizer(language).tokenize
+    except (ImportError, LookupError) as e:
+        logger.warning(f"NLTK Punkt tokenizer unavailable ({type(e).__name__}), falling back to regex sentence splitting")
+        return regex_split
+
+def split_documents(documents: List[str], language: str = "english") -> List[List[str]]:
+    """
+    Split each document into sentences.
+    
+    Args:
+        documents: Documents to split.
+        language: Punkt model language.
+    
+    Returns:
+        One list of sentences per document.
+    """
+    split = get_sentence_splitter(language)
+    return [split(document) if document and document.strip() else [] for document in documents]
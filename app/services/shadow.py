@@ -0,0 +1,97 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from app.core.logging import logger
+from app.core.metrics import (
+    SHADOW_AGREEMENTS,
+    SHADOW_LABELS,
+    SHADOW_LATENCY,
+    SHADOW_REQUESTS,
+    SHADOW_SENTENCES,
+)
+from app.services.registry import ModelRegistry
+
+class ShadowEvaluator:
+    """
+    Scores a sample of live requests with a candidate model off the critical path.
+
+    Work is handed to a small background executor after the primary response
+    has been sent. At most `max_pending` evaluations are in flight or queued;
+    anything beyond that is dropped rather than queued, so a saturated box
+    never builds up a shadow backlog.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        model_name: str,
+        sample_rate: float,
+        max_workers: int = 1,
+        max_pending: int = 4
+    ):
+        """
+        Initialize the shadow evaluator.
+
+        Args:
+            registry: Registry the candidate model is loaded from.
+            model_name: Registry name of the candidate model.
+            sample_rate: Fraction of requests (0-1) also scored by the candidate.
+            max_workers: Background threads scoring shadow requests.
+            max_pending: Maximum shadow requests in flight or queued.
+        """
+        self.registry = registry
+        self.model_name = model_name
+        self.sample_rate = sample_rate
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shadow")
+
+    def submit(self, sentences: List[str], primary_predictions: List[str]) -> bool:
+        """
+        Offer a scored request for shadow evaluation.
+
+        Args:
+            sentences: Sentences from the request.
+            primary_predictions: Predictions returned by the primary model.
+
+        Returns:
+            True if the request was handed to the executor, False if it was
+            not sampled or was dropped because the executor is saturated.
+        """
+        if not sentences or random.random() >= self.sample_rate:
+            return False
+        if not self._slots.acquire(blocking=False):
+            SHADOW_REQUESTS.labels(model=self.model_name, outcome="dropped").inc()
+            return False
+        try:
+            self._executor.submit(self._evaluate, list(sentences), list(primary_predictions))
+        except RuntimeError:
+            # Executor has been shut down
+            self._slots.release()
+            return False
+        return True
+
+    def _evaluate(self, sentences: List[str], primary_predictions: List[str]) -> None:
+        """Score sentences with the candidate model and record comparison metrics."""
+        try:
+            candidate = self.registry.get(self.model_name)
+            start_time = time.time()
+            predictions = candidate.predict(sentences)
+            SHADOW_LATENCY.labels(model=self.model_name).observe(time.time() - start_time)
+
+            agreements = sum(1 for shadow, primary in zip(predictions, primary_predictions) if shadow == primary)
+            SHADOW_SENTENCES.labels(model=self.model_name).inc(len(predictions))
+            SHADOW_AGREEMENTS.labels(model=self.model_name).inc(agreements)
+            for label in predictions:
+                SHADOW_LABELS.labels(model=self.model_name, label=label).inc()
+            SHADOW_REQUESTS.labels(model=self.model_name, outcome="scored").inc()
+        except Exception as e:
+            logger.error(f"Shadow evaluation with model '{self.model_name}' failed: {str(e)}")
+            SHADOW_REQUESTS.labels(model=self.model_name, outcome="failed").inc()
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        """Stop the executor, discarding shadow requests that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
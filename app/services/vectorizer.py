@@ -0,0 +1,166 @@
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+import re
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+# scikit-learn's default token pattern; tokens never span whitespace
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+# Longer chunks are resolved without caching, bounding the cache's memory to
+# about cache_size * MAX_CACHED_CHUNK_LENGTH characters of keys
+MAX_CACHED_CHUNK_LENGTH = 64
+
+class CachedTfidfVectorizer:
+    """
+    Serving-side replacement for a fitted `TfidfVectorizer.transform`.
+
+    Documents are split on whitespace and each chunk is resolved to its
+    feature indices through a bounded LRU cache, so the regex tokenization,
+    lowercasing and vocabulary lookups only run for chunks not seen recently.
+    Chunks longer than MAX_CACHED_CHUNK_LENGTH (rarely real words, but easy
+    to send in bulk) are resolved directly and never cached.
+    The batch's CSR matrix is then built directly from preallocated index
+    arrays and weighted the same way `TfidfTransformer` does.
+
+    Only unigram word analyzers with the default token pattern and no custom
+    preprocessor, tokenizer or accent stripping are supported (see
+    `supports`); for those the output equals `vectorizer.transform`.
+    """
+
+    def __init__(self, vectorizer: TfidfVectorizer, cache_size: int):
+        """
+        Initialize the cached vectorizer.
+
+        Args:
+            vectorizer: Fitted TfidfVectorizer.
+            cache_size: Maximum number of whitespace chunks kept in the cache.
+        """
+        self.vectorizer = vectorizer
+        self.n_features = len(vectorizer.vocabulary_)
+        self.dtype = vectorizer.dtype
+        self.binary = vectorizer.binary
+        self.sublinear_tf = vectorizer.sublinear_tf
+        self.norm = vectorizer.norm
+        self.idf = vectorizer.idf_.astype(self.dtype) if vectorizer.use_idf else None
+        self.lowercase = vectorizer.lowercase
+        self.token_pattern = re.compile(vectorizer.token_pattern)
+        # Stop words are removed before the vocabulary lookup in scikit-learn
+        stop_words = vectorizer.get_stop_words() or frozenset()
+        self.vocabulary = {
+            token: index for token, index in vectorizer.vocabulary_.items() if token not in stop_words
+        }
+        self.lookup = lru_cache(maxsize=cache_size)(self._resolve_chunk)
+
+    @staticmethod
+    def supports(vectorizer: Any) -> bool:
+        """Check whether a vectorizer can be served by CachedTfidfVectorizer."""
+        return (
+            isinstance(vectorizer, TfidfVectorizer)
+            and hasattr(vectorizer, "vocabulary_")
+            and vectorizer.analyzer == "word"
+            and tuple(vectorizer.ngram_range) == (1, 1)
+            and vectorizer.token_pattern == DEFAULT_TOKEN_PATTERN
+            and vectorizer.tokenizer is None
+            and vectorizer.preprocessor is None
+            and vectorizer.strip_accents is None
+            and vectorizer.input == "content"
+        )
+
+    def _resolve_chunk(self, chunk: str) -> Tuple[int, ...]:
+        """Tokenize one whitespace-delimited chunk and map its tokens to feature indices."""
+        if self.lowercase:
+            chunk = chunk.lower()
+        vocabulary = self.vocabulary
+        return tuple(vocabulary[token] for token in self.token_pattern.findall(chunk) if token in vocabulary)
+
+    def transform(self, raw_documents: List[str]) -> sp.csr_matrix:
+        """
+        Transform documents to a tf-idf weighted document-term matrix.
+
+        Args:
+            raw_documents: Documents to transform.
+
+        Returns:
+            CSR matrix of shape (len(raw_documents), n_features).
+        """
+        if isinstance(raw_documents, str):
+            raise ValueError("Iterable over raw text documents expected, string object received.")
+        lookup = self.lookup
+        resolve = self._resolve_chunk
+        num_documents = len(raw_documents)
+
+        # Resolve every chunk through the cache, recording row boundaries
+        indptr = np.empty(num_documents + 1, dtype=np.int64)
+        indptr[0] = 0
+        feature_indices = []
+        for i, document in enumerate(raw_documents):
+            for chunk in document.split():
+                if len(chunk) <= MAX_CACHED_CHUNK_LENGTH:
+                    feature_indices.extend(lookup(chunk))
+                else:
+                    feature_indices.extend(resolve(chunk))
+            indptr[i + 1] = len(feature_indices)
+
+        # Copy into arrays preallocated to the exact number of entries
+        total = len(feature_indices)
+        index_dtype = np.int32 if total <= np.iinfo(np.int32).max else np.int64
+        indices = np.fromiter(feature_indices, dtype=index_dtype, count=total)
+        data = np.ones(total, dtype=self.dtype)
+
+        X = sp.csr_matrix(
+            (data, indices, indptr.astype(index_dtype, copy=False)),
+            shape=(num_documents, self.n_features)
+        )
+        # Sort indices within each row and add up repeated tokens into counts
+        X.sum_duplicates()
+
+        if self.binary:
+            X.data.fill(1)
+        if self.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1.0
+        if self.idf is not None:
+            X.data *= self.idf[X.indices]
+        if self.norm is not None:
+            X = normalize(X, norm=self.norm, copy=False)
+        return X
+
+class CachedPipeline:
+    """
+    Predicts with a fitted Pipeline whose first step is a TfidfVectorizer,
+    replacing that step with a CachedTfidfVectorizer.
+    """
+
+    def __init__(self, pipeline: Any, cache_size: int):
+        """
+        Initialize the cached pipeline.
+
+        Args:
+            pipeline: Fitted scikit-learn Pipeline starting with a TfidfVectorizer.
+            cache_size: Maximum number of whitespace chunks kept in the token cache.
+        """
+        self.pipeline = pipeline
+        self.vectorizer = CachedTfidfVectorizer(pipeline.steps[0][1], cache_size)
+        self.downstream = pipeline[1:]
+
+    @classmethod
+    def from_model(cls, model: Any, cache_size: int) -> Optional["CachedPipeline"]:
+        """
+        Build a CachedPipeline for a model if it is supported.
+
+        Returns:
+            The cached pipeline, or None if the model is not a supported pipeline
+            or the cache is disabled.
+        """
+        steps = getattr(model, "steps", None)
+        if cache_size <= 0 or not isinstance(steps, list) or len(steps) < 2:
+            return None
+        if not CachedTfidfVectorizer.supports(steps[0][1]):
+            return None
+        return cls(model, cache_size)
+
+    def predict(self, sentences: List[str]) -> Any:
+        """Predict labels for sentences."""
+        return self.downstream.predict(self.vectorizer.transform(sentences))
@@ -0,0 +1,69 @@
+"""
+Batch job runner: scores queued batch jobs in a dedicated low-priority process.
+
+Usage:
+    python -m app.worker
+
+Running jobs outside the API workers keeps batch scoring off their event
+loops and GIL, and makes the CPU cap global: one runner uses at most
+JOBS_WORKERS * JOBS_CPU_SHARE cores at niceness JOBS_NICE, however many API
+workers there are. Run a single runner per jobs database.
+
+The runner serves its own Prometheus metrics on JOBS_METRICS_PORT and
+deletes finished jobs older than JOBS_RETENTION_S.
+"""
+import os
+
+# Metrics are served by this process alone, not aggregated with the API workers'
+# files. This must run before anything imports prometheus_client metrics.
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+import signal
+import threading
+from types import SimpleNamespace
+from prometheus_client import start_http_server
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.jobs import JobQueue, JobWorkerPool
+from app.services.model_service import ModelService, resolve_model_service
+from app.services.registry import get_model_registry
+from app.services.singleton import load_model
+
+# Seconds between sweeps for finished jobs past JOBS_RETENTION_S
+RETENTION_SWEEP_SECONDS = 60.0
+
+def main() -> None:
+    """Run the job worker threads until SIGTERM or SIGINT."""
+    # Threads inherit the niceness of the thread that creates them
+    os.nice(settings.JOBS_NICE)
+    start_http_server(settings.JOBS_METRICS_PORT)
+
+    load_model(settings.MODEL_PATH)
+    state = SimpleNamespace(
+        model_service=ModelService(),
+        model_registry=get_model_registry()
+    )
+    queue = JobQueue(settings.JOBS_DB_PATH, settings.JOBS_DIR, lease_timeout=settings.JOBS_LEASE_TIMEOUT_S)
+    pool = JobWorkerPool(
+        queue,
+        lambda model_name: resolve_model_service(state, model_name),
+        workers=settings.JOBS_WORKERS,
+        chunk_size=settings.JOBS_CHUNK_SIZE,
+        cpu_share=settings.JOBS_CPU_SHARE,
+        poll_interval=settings.JOBS_POLL_INTERVAL_S
+    ).start()
+    logger.info(f"Batch job runner started with {settings.JOBS_WORKERS} workers")
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    # Delete finished jobs and their files once they are older than the retention period
+    while not stop.wait(RETENTION_SWEEP_SECONDS):
+        if settings.JOBS_RETENTION_S > 0:
+            queue.purge_finished(settings.JOBS_RETENTION_S)
+    logger.info("Stopping batch job runner")
+    # Jobs still mid-chunk after the timeout are requeued once their lease expires
+    pool.stop(timeout=settings.JOBS_LEASE_TIMEOUT_S)
+
+if __name__ == "__main__":
+    main()
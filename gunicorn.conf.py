@@ -0,0 +1,54 @@
+"""
+Gunicorn configuration for serving the API with preloaded, forked workers.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The default model and the preloaded registry models are loaded once in the
+master process before the workers are forked, so each worker shares their
+memory pages copy-on-write and starts without repeating the loads. Each worker then warms up its own model
+service (and its caches) before reporting ready on /ready.
+
+With PROMETHEUS_MULTIPROC_DIR set, metrics from all workers are aggregated
+on /metrics; files of dead workers are compacted when they exit.
+"""
+import gc
+import glob
+import os
+
+# prometheus_client metrics create their files on import, so the directory must
+# exist before the app is preloaded. Gunicorn re-executes this file on reload
+# (SIGHUP), so it must not delete anything here; see on_starting.
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+from app.core.config import settings
+
+bind = f"{settings.HOST}:{settings.PORT}"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+def on_starting(server):
+    """Clear stale metric files and load the models in the master before any worker is forked."""
+    from app.services.registry import get_model_registry
+    from app.services.singleton import load_model
+
+    # Only a fresh master starts from a clean metrics directory; a master started
+    # by a binary upgrade (USR2) shares it with the old master's live workers
+    if MULTIPROC_DIR and "GUNICORN_PID" not in os.environ:
+        for path in glob.glob(os.path.join(MULTIPROC_DIR, "*.db")):
+            os.remove(path)
+
+    load_model(settings.MODEL_PATH)
+    get_model_registry().preload()
+    # Move everything allocated so far out of the GC's reach so collections in the
+    # workers don't touch (and copy) the shared model pages
+    gc.freeze()
+
+def child_exit(server, worker):
+    """Fold a dead worker's metrics into the archive files so totals survive restarts."""
+    if MULTIPROC_DIR:
+        from app.core.metrics import compact_dead_worker
+        compact_dead_worker(worker.pid, MULTIPROC_DIR)
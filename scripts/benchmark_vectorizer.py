@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+import random
+import argparse
+import joblib
+import numpy as np
+from sklearn.pipeline import Pipeline
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+# Add the project root directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.logging import logger
+from app.services.vectorizer import CachedTfidfVectorizer
+
+COMMON_WORDS = [
+    "the", "a", "and", "but", "it", "was", "is", "this", "book", "story", "author",
+    "characters", "plot", "ending", "read", "great", "good", "bad", "boring", "loved",
+    "hated", "really", "not", "very", "pages", "writing", "series", "recommend",
+]
+
+def make_sentences(num_sentences: int, vocabulary_size: int, seed: int):
+    """
+    Generate review-like sentences with a Zipf-like word distribution.
+
+    Args:
+        num_sentences: Number of sentences to generate
+        vocabulary_size: Number of distinct rare words
+        seed: Random seed for reproducibility
+
+    Returns:
+        List of sentences
+    """
+    rng = random.Random(seed)
+    words = COMMON_WORDS + [f"word{i}" for i in range(vocabulary_size)]
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    sentences = []
+    for _ in range(num_sentences):
+        tokens = rng.choices(words, weights=weights, k=rng.randint(4, 30))
+        tokens[0] = tokens[0].capitalize()
+        sentences.append(" ".join(tokens) + rng.choice([".", "!", "?", "..."]))
+    return sentences
+
+def time_transform(transform, batch, repeats: int) -> float:
+    """Return the median transform time in milliseconds."""
+    timings = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        transform(batch)
+        timings.append((time.perf_counter() - start_time) * 1000)
+    return float(np.median(timings))
+
+def benchmark(model_path: str = None, batch_sizes=(1, 8, 32, 128, 512, 2048), repeats: int = 20, cache_size: int = 100000):
+    """
+    Compare pipeline.transform against CachedTfidfVectorizer.transform.
+
+    Args:
+        model_path: Trained model to benchmark; a synthetic pipeline is trained if omitted
+        batch_sizes: Batch sizes to time
+        repeats: Timed repetitions per batch size
+        cache_size: Token cache size
+    """
+    sentences = make_sentences(max(batch_sizes) * 4, vocabulary_size=5000, seed=42)
+    if model_path:
+        pipeline = joblib.load(model_path)
+    else:
+        labels = [random.Random(i).choice(["positive", "neutral", "negative"]) for i in range(len(sentences))]
+        pipeline = Pipeline([
+            ('tfidf', TfidfVectorizer(stop_words='english')),
+            ('clf', LogisticRegression(max_iter=200))
+        ]).fit(sentences, labels)
+
+    vectorizer = pipeline.steps[0][1]
+    if not CachedTfidfVectorizer.supports(vectorizer):
+        raise ValueError("The model's vectorizer is not supported by CachedTfidfVectorizer")
+    cached = CachedTfidfVectorizer(vectorizer, cache_size)
+
+    # Warm the token cache with traffic-like data, then time unseen batches
+    cached.transform(sentences[:len(sentences) // 2])
+    held_out = sentences[len(sentences) // 2:]
+    difference = abs(vectorizer.transform(held_out) - cached.transform(held_out)).max()
+    logger.info(f"Max absolute difference vs pipeline.transform: {difference}")
+
+    logger.info(f"{'batch':>6} {'sklearn ms':>11} {'cached ms':>10} {'speedup':>8}")
+    for batch_size in batch_sizes:
+        batch = held_out[:batch_size]
+        baseline_ms = time_transform(vectorizer.transform, batch, repeats)
+        cached_ms = time_transform(cached.transform, batch, repeats)
+        logger.info(f"{batch_size:>6} {baseline_ms:>11.3f} {cached_ms:>10.3f} {baseline_ms / cached_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the cached TF-IDF transform against pipeline.transform")
+    parser.add_argument("--model_path", type=str, help="Path to a trained model (default: train a synthetic one)")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed repetitions per batch size")
+    parser.add_argument("--cache_size", type=int, default=100000, help="Token cache size")
+
+    args = parser.parse_args()
+    benchmark(args.model_path, repeats=args.repeats, cache_size=args.cache_size)
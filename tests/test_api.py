@@ -1,4 +1,5 @@
 import json
+import os
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
@@ -31,4 +32,134 @@ def test_predict_endpoint(mock_predict, test_client, mock_model_service):
     assert response.json() == {
         "predictions": ["positive", "negative"],
         "processing_time_ms": response.json().get("processing_time_ms")  # Ensure processing_time_ms exists
-    }
\ No newline at end of file
+    }
+
+def test_ready_endpoint(test_client):
+    """Test the readiness endpoint before and after warm-up."""
+    app.state.ready = False
+    response = test_client.get("/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "warming_up"}
+
+    app.state.ready = True
+    response = test_client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+def test_predict_model_routing(test_client, mock_model_service, test_model_path):
+    """Test selecting a registry model by header and by path."""
+    from app.services.registry import ModelRegistry
+    app.state.model_registry = ModelRegistry({"books": test_model_path}, memory_budget_bytes=10 * 1024 * 1024)
+    test_data = {"sentences": ["I love this", "I hate this"]}
+
+    response = test_client.post("/api/v1/predict", json=test_data, headers={"X-Model-Name": "books"})
+    assert response.status_code == 200
+    assert response.json()["predictions"] == ["positive", "negative"]
+
+    response = test_client.post("/api/v1/models/books/predict", json=test_data)
+    assert response.status_code == 200
+    assert response.json()["predictions"] == ["positive", "negative"]
+
+    response = test_client.post("/api/v1/models/missing/predict", json=test_data)
+    assert response.status_code == 404
+
+    response = test_client.get("/api/v1/models")
+    assert response.json() == {
+        "default": "default",
+        "models": ["default", "books"],
+        "loaded": ["default", "books"]
+    }
+    del app.state.model_registry
+
+def test_predict_offers_shadow_evaluation(test_client, mock_model_service):
+    """Test default-model predictions are handed to the shadow evaluator after the response."""
+    shadow_evaluator = MagicMock()
+    app.state.shadow_evaluator = shadow_evaluator
+    test_data = {"sentences": ["I love this product!", "This was a terrible experience."]}
+    response = test_client.post("/api/v1/predict", json=test_data)
+    assert response.status_code == 200
+    shadow_evaluator.submit.assert_called_once_with(test_data["sentences"], ["positive", "negative"])
+    app.state.shadow_evaluator = None
+
+def test_predict_documents_endpoint(test_client, test_model_path, monkeypatch):
+    """Test documents are split server-side, scored together and aggregated per document."""
+    import joblib
+    from app.services.model_service import ModelService
+    from app.services.sentence_splitter import regex_split
+    monkeypatch.setattr(app.state, "model_service", ModelService(model=joblib.load(test_model_path)), raising=False)
+    test_data = {"documents": ["I love this. I love this! I hate this.", "I hate this.", ""]}
+
+    with patch("app.services.sentence_splitter.get_sentence_splitter", return_value=regex_split):
+        response = test_client.post("/api/v1/predict/documents", json=test_data)
+    assert response.status_code == 200
+    documents = response.json()["documents"]
+    assert documents[0]["sentences"] == ["I love this.", "I love this!", "I hate this."]
+    assert documents[0]["predictions"] == ["positive", "positive", "negative"]
+    assert documents[0]["label_counts"] == {"positive": 2, "negative": 1}
+    assert documents[0]["sentiment"] == "positive"
+    assert documents[1]["sentiment"] == "negative"
+    assert documents[2] == {"sentences": [], "predictions": [], "label_counts": {}, "sentiment": None}
+    assert response.json()["processing_time_ms"] is not None
+
+def test_predict_documents_size_limit(test_client, mock_model_service, monkeypatch):
+    """Test document requests over the character limit are rejected before scoring."""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "DOCUMENTS_MAX_CHARS", 10)
+    response = test_client.post("/api/v1/predict/documents", json={"documents": ["I love this.", "I hate this."]})
+    assert response.status_code == 413
+    mock_model_service.predict.assert_not_called()
+
+def test_batch_job_endpoints(test_client, mock_model_service, tmp_path):
+    """Test submitting, polling and downloading a batch job."""
+    from app.services.jobs import JobQueue, JobWorkerPool
+    app.state.job_queue = JobQueue(str(tmp_path / "jobs.db"), str(tmp_path / "jobs"))
+    mock_model_service.predict.side_effect = lambda x: ["positive"] * len(x)
+
+    response = test_client.post("/api/v1/jobs", content=b"I love this\nI hate this")
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert response.json() == {"job_id": job_id, "status": "queued", "total": 2}
+
+    assert test_client.get(f"/api/v1/jobs/{job_id}/result").status_code == 409
+    JobWorkerPool(app.state.job_queue, lambda name: app.state.model_service, cpu_share=1.0).run_next()
+
+    status = test_client.get(f"/api/v1/jobs/{job_id}").json()
+    assert status["status"] == "completed"
+    assert status["processed"] == 2
+    response = test_client.get(f"/api/v1/jobs/{job_id}/result")
+    assert response.status_code == 200
+    assert response.text == "positive\npositive\n"
+
+    assert test_client.get("/api/v1/jobs/missing").status_code == 404
+    assert test_client.post("/api/v1/jobs", content=b"").status_code == 400
+    assert test_client.post("/api/v1/jobs", content=b"x", headers={"X-Model-Name": "missing"}).status_code == 404
+
+    assert test_client.delete(f"/api/v1/jobs/{job_id}").status_code == 204
+    assert test_client.get(f"/api/v1/jobs/{job_id}").status_code == 404
+    assert test_client.delete(f"/api/v1/jobs/{job_id}").status_code == 404
+    app.state.job_queue = None
+
+def test_batch_job_upload_size_limit(test_client, tmp_path, monkeypatch):
+    """Test oversized job uploads are rejected and their partial input removed."""
+    from app.core.config import settings
+    from app.services.jobs import JobQueue
+    monkeypatch.setattr(app.state, "job_queue", JobQueue(str(tmp_path / "jobs.db"), str(tmp_path / "jobs")), raising=False)
+    monkeypatch.setattr(settings, "JOBS_MAX_UPLOAD_MB", 8 / (1024 * 1024))
+
+    response = test_client.post("/api/v1/jobs", content=b"I love this\nI hate this\n")
+    assert response.status_code == 413
+    assert os.listdir(tmp_path / "jobs") == []
+
+def test_warm_up_marks_ready(mock_model_service):
+    """Test the background warm-up flips readiness only when it succeeds."""
+    import asyncio
+    from app.main import warm_up_and_mark_ready
+    app.state.ready = False
+    with patch.object(app.state.model_service, "warm_up", side_effect=RuntimeError("boom")):
+        asyncio.run(warm_up_and_mark_ready(app))
+    assert app.state.ready is False
+
+    with patch.object(app.state.model_service, "warm_up") as mock_warm_up:
+        asyncio.run(warm_up_and_mark_ready(app))
+    mock_warm_up.assert_called_once()
+    assert app.state.ready is True
@@ -0,0 +1,59 @@
+import joblib
+import pytest
+from prometheus_client import REGISTRY
+from app.services.drift import DriftMonitor, HyperLogLog, find_vectorizer
+
+def sample(name, **labels):
+    """Read a metric sample, treating a missing series as zero."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+def test_hyperloglog_estimate():
+    """Test the HyperLogLog estimate is within a few percent of the true count."""
+    sketch = HyperLogLog()
+    for i in range(100000):
+        sketch.add(f"token-{i % 50000}")
+    assert abs(sketch.count() - 50000) / 50000 < 0.05
+    assert len(sketch.registers) == 4096
+
+def test_hyperloglog_small_counts():
+    """Test the small-range correction for few distinct items."""
+    sketch = HyperLogLog()
+    assert sketch.count() == 0
+    sketch.update(["a", "b", "c", "a"])
+    assert round(sketch.count()) == 3
+
+def test_find_vectorizer(test_model_path):
+    """Test the vectorizer is found in a pipeline and not in other models."""
+    model = joblib.load(test_model_path)
+    assert find_vectorizer(model) is model.named_steps["tfidf"]
+    assert find_vectorizer(object()) is None
+
+def test_drift_monitor_observe(test_model_path):
+    """Test label, length and OOV metrics are updated for sampled requests."""
+    monitor = DriftMonitor(joblib.load(test_model_path), "drift-test", sample_rate=1.0)
+    monitor.observe(["I love this", "unknown words here"], ["positive", "neutral"])
+
+    assert sample("model_predictions_total", model="drift-test", label="positive") == 1
+    assert sample("model_predictions_total", model="drift-test", label="neutral") == 1
+    assert sample("input_sentence_length_words_count", model="drift-test") == 2
+    # Vocabulary is {love, hate, this, it, okay}; default token pattern drops "I"
+    assert sample("input_tokens_total", model="drift-test") == 5
+    assert sample("input_oov_tokens_total", model="drift-test") == 3
+    assert round(sample("input_oov_distinct_tokens_estimate", model="drift-test")) == 3
+    assert round(sample("input_distinct_tokens_estimate", model="drift-test")) == 5
+
+def test_drift_monitor_unsampled(test_model_path):
+    """Test token statistics are skipped outside the sample rate but labels are still counted."""
+    monitor = DriftMonitor(joblib.load(test_model_path), "drift-unsampled", sample_rate=0.0)
+    monitor.observe(["I love this"], ["positive"])
+    assert sample("model_predictions_total", model="drift-unsampled", label="positive") == 1
+    assert sample("input_tokens_total", model="drift-unsampled") == 0
+
+def test_drift_monitor_sample_is_bounded(test_model_path):
+    """Test at most max_sentences sentences of a large batch are inspected."""
+    monitor = DriftMonitor(joblib.load(test_model_path), "drift-bounded", sample_rate=1.0, max_sentences=4)
+    sentences = [f"I love this {i}" for i in range(1000)]
+    assert len(monitor.sample(sentences)) == 4
+    monitor.observe(sentences, ["positive"] * len(sentences))
+    assert sample("model_predictions_total", model="drift-bounded", label="positive") == 1000
+    assert sample("input_sentence_length_words_count", model="drift-bounded") == 4
@@ -0,0 +1,157 @@
+import os
+import time
+from contextlib import closing
+import pytest
+import numpy as np
+from unittest.mock import MagicMock
+from app.services.jobs import JobQueue, JobWorkerPool
+from app.services.model_service import ModelService
+
+@pytest.fixture
+def job_queue(tmp_path):
+    """Create a job queue in a temporary directory."""
+    return JobQueue(str(tmp_path / "jobs.db"), str(tmp_path / "jobs"))
+
+@pytest.fixture
+def model_service():
+    """Model service labelling sentences by length."""
+    model = MagicMock()
+    model.predict.side_effect = lambda x: np.array(["positive" if len(s) > 3 else "negative" for s in x])
+    return ModelService(model=model)
+
+def submit_lines(job_queue, lines, model_name=None):
+    """Write an input file and queue a job for it."""
+    paths = job_queue.new_job_paths()
+    with open(paths["input_path"], "w", encoding="utf-8") as input_file:
+        input_file.write("\n".join(lines) + "\n")
+    job_queue.submit(paths["id"], paths["input_path"], paths["result_path"], len(lines), model_name)
+    return paths
+
+def test_job_processed_in_chunks(job_queue, model_service):
+    """Test a job is scored chunk by chunk and its result written in input order."""
+    paths = submit_lines(job_queue, ["Great", "bad", "Loved it", "no"])
+    pool = JobWorkerPool(job_queue, lambda name: model_service, chunk_size=3, cpu_share=1.0)
+
+    assert pool.run_next()
+    assert not pool.run_next()
+
+    job = job_queue.get(paths["id"])
+    assert job["status"] == "completed"
+    assert job["processed"] == 4
+    with open(paths["result_path"], encoding="utf-8") as result:
+        assert result.read().splitlines() == ["positive", "negative", "positive", "negative"]
+    assert not os.path.exists(paths["input_path"])
+    assert [len(call.args[0]) for call in model_service.model.predict.call_args_list] == [3, 1]
+
+def test_job_failure_recorded(job_queue, model_service):
+    """Test a failing job is marked failed with the error and leaves no partial result."""
+    paths = submit_lines(job_queue, ["Great"])
+    model_service.model.predict.side_effect = Exception("model exploded")
+    pool = JobWorkerPool(job_queue, lambda name: model_service, cpu_share=1.0)
+    assert pool.run_next()
+    job = job_queue.get(paths["id"])
+    assert job["status"] == "failed"
+    assert "model exploded" in job["error"]
+    # Neither the input nor a partial result is kept for a failed job
+    assert os.listdir(job_queue.jobs_dir) == []
+
+def test_job_claimed_once(job_queue):
+    """Test a queued job can only be claimed by one worker."""
+    paths = submit_lines(job_queue, ["Great"])
+    job = job_queue.claim()
+    assert job["id"] == paths["id"]
+    assert job_queue.claim() is None
+    assert job_queue.get(paths["id"])["owner"] == job["owner"]
+
+def expire_lease(job_queue, job_id):
+    """Backdate a running job's heartbeat past the lease timeout."""
+    with closing(job_queue._connect()) as conn:
+        conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time() - job_queue.lease_timeout - 1, job_id))
+
+def test_expired_lease_requeued(job_queue):
+    """Test running jobs without a recent heartbeat are claimed again and their old owner is fenced off."""
+    orphan = submit_lines(job_queue, ["Great"])
+    stale = job_queue.claim()
+    live = submit_lines(job_queue, ["Bad"])
+    job_queue.claim()
+    expire_lease(job_queue, orphan["id"])
+
+    reclaimed = job_queue.claim()
+    assert reclaimed["id"] == orphan["id"]
+    assert reclaimed["owner"] != stale["owner"]
+    assert job_queue.get(live["id"])["status"] == "running"
+    # The previous owner can no longer report progress or finish the job
+    assert not job_queue.update_progress(orphan["id"], stale["owner"], 1)
+    assert not job_queue.finish(orphan["id"], stale["owner"], "completed")
+    assert job_queue.update_progress(orphan["id"], reclaimed["owner"], 1)
+
+def test_job_stops_when_lease_lost(job_queue, model_service):
+    """Test a worker stops scoring and discards its output once another claim takes the job over."""
+    paths = submit_lines(job_queue, ["Great", "bad", "Loved it", "no"])
+    pool = JobWorkerPool(job_queue, lambda name: model_service, chunk_size=2, cpu_share=1.0)
+
+    def take_over(x):
+        expire_lease(job_queue, paths["id"])
+        job_queue.claim()
+        return np.array(["positive"] * len(x))
+    model_service.model.predict.side_effect = take_over
+
+    assert pool.run_next()
+    assert model_service.model.predict.call_count == 1
+    assert job_queue.get(paths["id"])["status"] == "running"
+    assert not os.path.exists(paths["result_path"])
+    assert sorted(os.listdir(job_queue.jobs_dir)) == [os.path.basename(paths["input_path"])]
+
+def test_cpu_share_throttles_jobs(job_queue, model_service):
+    """Test workers idle after each chunk in proportion to the CPU share."""
+    def slow_predict(x):
+        time.sleep(0.02)
+        return np.array(["positive"] * len(x))
+    model_service.model.predict.side_effect = slow_predict
+    submit_lines(job_queue, ["Great"] * 4)
+    pool = JobWorkerPool(job_queue, lambda name: model_service, chunk_size=2, cpu_share=0.5)
+
+    start_time = time.time()
+    pool.run_next()
+    # Two chunks of ~20ms busy, each followed by ~20ms idle
+    assert time.time() - start_time >= 0.075
+
+def test_worker_threads_start_and_stop(job_queue, model_service):
+    """Test background workers pick up queued jobs and stop cleanly."""
+    paths = submit_lines(job_queue, ["Great", "bad"])
+    pool = JobWorkerPool(job_queue, lambda name: model_service, cpu_share=1.0, poll_interval=0.01).start()
+    deadline = time.time() + 5
+    while job_queue.get(paths["id"])["status"] != "completed" and time.time() < deadline:
+        time.sleep(0.01)
+    pool.stop()
+    assert job_queue.get(paths["id"])["status"] == "completed"
+
+def test_delete_job(job_queue, model_service):
+    """Test finished and queued jobs are deleted with their files, running jobs are kept."""
+    finished = submit_lines(job_queue, ["Great"])
+    JobWorkerPool(job_queue, lambda name: model_service, cpu_share=1.0).run_next()
+    assert job_queue.delete(finished["id"])
+    assert job_queue.get(finished["id"]) is None
+    assert not os.path.exists(finished["result_path"])
+
+    running = submit_lines(job_queue, ["Great"])
+    job_queue.claim()
+    assert not job_queue.delete(running["id"])
+    assert os.path.exists(running["input_path"])
+    assert not job_queue.delete("missing")
+
+def test_purge_finished_jobs(job_queue, model_service):
+    """Test finished jobs older than the retention period are purged with their results."""
+    old = submit_lines(job_queue, ["Great"])
+    JobWorkerPool(job_queue, lambda name: model_service, cpu_share=1.0).run_next()
+    with closing(job_queue._connect()) as conn:
+        conn.execute("UPDATE jobs SET finished_at = ? WHERE id = ?", (time.time() - 3600, old["id"]))
+    recent = submit_lines(job_queue, ["Bad"])
+    JobWorkerPool(job_queue, lambda name: model_service, cpu_share=1.0).run_next()
+    queued = submit_lines(job_queue, ["Meh"])
+
+    assert job_queue.purge_finished(retention=60) == 1
+    assert job_queue.get(old["id"]) is None
+    assert not os.path.exists(old["result_path"])
+    assert job_queue.get(recent["id"])["status"] == "completed"
+    assert job_queue.get(queued["id"])["status"] == "queued"
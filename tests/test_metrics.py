@@ -0,0 +1,70 @@
+import os
+import pytest
+from prometheus_client import CollectorRegistry
+from prometheus_client.mmap_dict import MmapedDict, mmap_key
+from app.core.metrics import LockedMultiProcessCollector, compact_dead_worker, make_metrics_app
+
+def write_worker_files(path, pid, requests):
+    """Write the counter, histogram and gauge files a worker would produce."""
+    counter = MmapedDict(os.path.join(path, f"counter_{pid}.db"))
+    counter.write_value(mmap_key("requests", "requests_total", ["endpoint"], ["/predict"], "Requests"), requests, 0)
+    counter.close()
+    histogram = MmapedDict(os.path.join(path, f"histogram_{pid}.db"))
+    for bucket, value in [("0.1", requests), ("+Inf", 0.0)]:
+        histogram.write_value(mmap_key("latency", "latency_bucket", ["le"], [bucket], "Latency"), value, 0)
+    histogram.write_value(mmap_key("latency", "latency_sum", [], [], "Latency"), 0.01 * requests, 0)
+    histogram.close()
+    for mode in ["livesum", "max"]:
+        gauge = MmapedDict(os.path.join(path, f"gauge_{mode}_{pid}.db"))
+        gauge.write_value(mmap_key(f"gauge_{mode}", f"gauge_{mode}", [], [], "Gauge"), 1.0, 0)
+        gauge.close()
+
+def scrape(path):
+    """Aggregate the directory the way /metrics does."""
+    registry = CollectorRegistry()
+    LockedMultiProcessCollector(registry, path=path)
+    return {
+        sample.name: sample.value
+        for metric in registry.collect()
+        for sample in metric.samples
+    }
+
+def test_multiprocess_aggregation(tmp_path):
+    """Test metrics from all workers are summed on scrape."""
+    write_worker_files(str(tmp_path), 101, 3.0)
+    write_worker_files(str(tmp_path), 102, 4.0)
+    samples = scrape(str(tmp_path))
+    assert samples["requests_total"] == 7.0
+    assert samples["latency_count"] == 7.0
+    assert samples["gauge_livesum"] == 2.0
+
+def test_compact_dead_worker_keeps_totals(tmp_path):
+    """Test compaction folds dead workers into archive files without changing totals."""
+    path = str(tmp_path)
+    for pid, requests in [(101, 3.0), (102, 4.0), (103, 5.0)]:
+        write_worker_files(path, pid, requests)
+    before = scrape(path)
+
+    compact_dead_worker(101, path)
+    compact_dead_worker(102, path)
+
+    files = sorted(name for name in os.listdir(path) if name.endswith(".db"))
+    assert files == [
+        "counter_103.db", "counter_archive.db",
+        "gauge_livesum_103.db", "gauge_max_103.db",
+        "histogram_103.db", "histogram_archive.db",
+    ]
+    after = scrape(path)
+    assert after["requests_total"] == before["requests_total"] == 12.0
+    assert after["latency_count"] == before["latency_count"] == 12.0
+    assert after["latency_sum"] == pytest.approx(before["latency_sum"])
+    assert after["gauge_livesum"] == 1.0
+
+def test_make_metrics_app_multiprocess(tmp_path, monkeypatch):
+    """Test the metrics app aggregates worker files when multiprocess mode is enabled."""
+    from starlette.testclient import TestClient
+    write_worker_files(str(tmp_path), 101, 3.0)
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    response = TestClient(make_metrics_app()).get("/")
+    assert response.status_code == 200
+    assert 'requests_total{endpoint="/predict"} 3.0' in response.text
@@ -1,7 +1,8 @@
 import pytest
 import numpy as np
 from unittest.mock import MagicMock, patch
-from app.services.model_service import ModelService
+from app.core.config import settings
+from app.services.model_service import ModelService, length_bucketed_batches
 import app.services.singleton as singleton
 
 @pytest.fixture(autouse=True)
@@ -56,3 +57,51 @@ def test_predict_error_handling(mock_model_service):
     service.model.predict.side_effect = Exception("Test error")
     with pytest.raises(RuntimeError, match="Prediction failed: Test error"):
         service.predict(["This will fail"])
+
+def test_model_service_warm_up():
+    """Test ModelService warm-up runs every batch size for every round."""
+    service = ModelService()
+    elapsed_ms = service.warm_up([1, 4], rounds=2)
+    batch_sizes = [len(call.args[0]) for call in service.model.predict.call_args_list]
+    assert batch_sizes == [1, 4, 1, 4]
+    assert elapsed_ms >= 0
+
+def test_predict_scores_unique_sentences_once():
+    """Test duplicate sentences are scored once and results keep input order."""
+    service = ModelService()
+    service.model.predict.side_effect = lambda x: np.array(["positive" if "good" in s else "negative" for s in x])
+    predictions = service.predict(["good", "bad", "good", "Five stars.", "good"])
+    assert predictions == ["positive", "negative", "positive", "negative", "positive"]
+    service.model.predict.assert_called_once()
+    assert service.model.predict.call_args.args[0] == ["good", "bad", "Five stars."]
+
+def test_predict_splits_large_batches(monkeypatch):
+    """Test batches over the character budget are scored in length-bucketed sub-batches."""
+    monkeypatch.setattr(settings, "PREDICT_SUB_BATCH_CHARS", 10)
+    service = ModelService()
+    service.model.predict.side_effect = lambda x: np.array([str(len(s)) for s in x])
+    sentences = ["aaaaaaa", "a", "aaaa", "aa", "aaaaaaaaaaaa", "aaa"]
+    predictions = service.predict(sentences)
+    assert predictions == [str(len(s)) for s in sentences]
+    sub_batches = [call.args[0] for call in service.model.predict.call_args_list]
+    assert sub_batches == [["a", "aa", "aaa", "aaaa"], ["aaaaaaa"], ["aaaaaaaaaaaa"]]
+
+def test_length_bucketed_batches_small_batch_unsplit():
+    """Test batches within the budget, or with splitting disabled, are returned whole."""
+    sentences = ["longer sentence", "short"]
+    assert length_bucketed_batches(sentences, 100) == [sentences]
+    assert length_bucketed_batches(sentences, 0) == [sentences]
+
+def test_warm_up_batches_are_unique():
+    """Test warm-up batches are not collapsed by deduplication."""
+    service = ModelService()
+    service.warm_up([1000])
+    batch = service.model.predict.call_args.args[0]
+    assert len(batch) == 1000
+    assert len(set(batch)) == 1000
+
+def test_drift_error_does_not_fail_prediction():
+    """Test an error in drift monitoring is logged and the predictions are still returned."""
+    service = ModelService()
+    with patch.object(service.drift, "observe", side_effect=Exception("sketch broke")):
+        assert service.predict(["I love this!"]) == ["positive"]
@@ -0,0 +1,96 @@
+import os
+import threading
+import joblib
+import pytest
+from unittest.mock import patch
+from app.services.registry import ModelRegistry, estimate_memory_bytes
+from app.services.model_service import ModelService
+
+@pytest.fixture
+def model_paths(test_model_path, tmp_path):
+    """Register three copies of the test model under different names."""
+    import shutil
+    paths = {}
+    for name in ["books", "electronics", "books-v2"]:
+        path = tmp_path / f"{name}.pkl"
+        shutil.copy(test_model_path, path)
+        paths[name] = str(path)
+    return paths
+
+def test_registry_loads_on_demand(model_paths):
+    """Test models are loaded on first use and reused afterwards."""
+    registry = ModelRegistry(model_paths, memory_budget_bytes=10 * 1024 * 1024)
+    assert registry.loaded() == []
+
+    service = registry.get("books")
+    assert isinstance(service, ModelService)
+    assert service.name == "books"
+    assert registry.get("books") is service
+    assert service.predict(["I love this"]) == ["positive"]
+
+def test_registry_lru_eviction(model_paths):
+    """Test least recently used models are evicted to stay within the memory budget."""
+    model_size = estimate_memory_bytes(joblib.load(model_paths["books"]))
+    registry = ModelRegistry(model_paths, memory_budget_bytes=2 * model_size)
+
+    registry.get("books")
+    registry.get("electronics")
+    registry.get("books")  # books is now most recently used
+    registry.get("books-v2")
+
+    assert registry.loaded() == ["books", "books-v2"]
+    assert registry.memory_used_bytes <= 2 * model_size
+
+def test_registry_preload_respects_budget(model_paths):
+    """Test preload stops once the memory budget is reached."""
+    model_size = estimate_memory_bytes(joblib.load(model_paths["books"]))
+    registry = ModelRegistry(model_paths, memory_budget_bytes=2 * model_size)
+    assert registry.preload() == ["books", "electronics"]
+
+def test_registry_unknown_model(model_paths):
+    """Test requesting an unregistered model raises KeyError."""
+    registry = ModelRegistry(model_paths, memory_budget_bytes=10 * 1024 * 1024)
+    with pytest.raises(KeyError, match="Unknown model: missing"):
+        registry.get("missing")
+
+def test_registry_memory_measured_after_loading(model_paths):
+    """Test a model's footprint is measured in memory, not taken from the artifact size."""
+    registry = ModelRegistry(model_paths, memory_budget_bytes=10 * 1024 * 1024)
+    registry.get("books")
+    assert registry.memory_used_bytes > os.path.getsize(model_paths["books"])
+
+def test_registry_loads_outside_lock(model_paths):
+    """Test a slow load neither blocks loaded models nor is repeated by concurrent callers."""
+    registry = ModelRegistry(model_paths, memory_budget_bytes=10 * 1024 * 1024)
+    loaded = registry.get("books")
+    release = threading.Event()
+    real_load = joblib.load
+    calls = []
+
+    def slow_load(path):
+        calls.append(path)
+        release.wait(5)
+        return real_load(path)
+
+    with patch("app.services.registry.joblib.load", side_effect=slow_load):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("electronics"))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        # Loaded models are served while "electronics" is loading
+        assert registry.get("books") is loaded
+        release.set()
+        for thread in threads:
+            thread.join(5)
+    assert len(calls) == 1
+    assert results[0] is results[1]
+
+def test_registry_preload_runs_once(model_paths):
+    """Test a second preload, e.g. in a worker forked after the master preloaded, reuses the loaded models."""
+    registry = ModelRegistry(model_paths, memory_budget_bytes=10 * 1024 * 1024)
+    assert registry.preload() == ["books", "electronics", "books-v2"]
+    services = [registry.get(name) for name in registry.loaded()]
+    with patch("app.services.registry.joblib.load") as mock_load:
+        assert registry.preload() == []
+    mock_load.assert_not_called()
+    assert [registry.get(name) for name in registry.loaded()] == services
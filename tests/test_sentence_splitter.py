@@ -0,0 +1,27 @@
+import pytest
+from unittest.mock import patch
+from app.services import sentence_splitter
+from app.services.sentence_splitter import get_sentence_splitter, regex_split, split_documents
+
+def test_regex_split():
+    """Test the regex fallback splits on terminal punctuation."""
+    assert regex_split("I loved it! Would read again.  Maybe?") == ["I loved it!", "Would read again.", "Maybe?"]
+    assert regex_split("   ") == []
+
+def test_get_sentence_splitter_is_cached():
+    """Test the splitter is only built once per language."""
+    assert get_sentence_splitter("english") is get_sentence_splitter("english")
+
+def test_split_documents():
+    """Test each document is split independently, empty documents give no sentences."""
+    with patch.object(sentence_splitter, "get_sentence_splitter", return_value=regex_split):
+        assert split_documents(["One. Two.", "", "Three"]) == [["One.", "Two."], [], ["Three"]]
+
+def test_splitter_falls_back_without_punkt_tokenizer():
+    """Test NLTK versions without PunktTokenizer fall back to the regex splitter."""
+    get_sentence_splitter.cache_clear()
+    try:
+        with patch.dict("sys.modules", {"nltk.tokenize": None}):
+            assert get_sentence_splitter("english") is regex_split
+    finally:
+        get_sentence_splitter.cache_clear()
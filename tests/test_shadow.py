@@ -0,0 +1,77 @@
+import threading
+import pytest
+import numpy as np
+from unittest.mock import MagicMock
+from prometheus_client import REGISTRY
+from app.services.model_service import ModelService
+from app.services.shadow import ShadowEvaluator
+
+def make_registry(predict):
+    """Create a registry stub serving a candidate model with the given predict function."""
+    candidate_model = MagicMock()
+    candidate_model.predict.side_effect = predict
+    registry = MagicMock()
+    registry.get.return_value = ModelService(model=candidate_model, name="candidate")
+    return registry
+
+def sample(name, **labels):
+    """Read a metric sample, treating a missing series as zero."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+def test_shadow_records_agreement_and_labels():
+    """Test shadow scoring records agreement, label distribution and latency."""
+    registry = make_registry(lambda x: np.array(["positive", "negative"][:len(x)]))
+    evaluator = ShadowEvaluator(registry, "candidate", sample_rate=1.0)
+    agreements_before = sample("shadow_agreements_total", model="candidate")
+    sentences_before = sample("shadow_sentences_total", model="candidate")
+    negative_before = sample("shadow_predictions_total", model="candidate", label="negative")
+    latency_before = sample("shadow_inference_latency_seconds_count", model="candidate")
+
+    assert evaluator.submit(["Great book", "Awful book"], ["positive", "positive"])
+    evaluator._executor.shutdown(wait=True)
+
+    assert sample("shadow_sentences_total", model="candidate") - sentences_before == 2
+    assert sample("shadow_agreements_total", model="candidate") - agreements_before == 1
+    assert sample("shadow_predictions_total", model="candidate", label="negative") - negative_before == 1
+    assert sample("shadow_inference_latency_seconds_count", model="candidate") - latency_before == 1
+
+def test_shadow_not_sampled():
+    """Test requests outside the sample rate are not scored."""
+    registry = make_registry(lambda x: np.array(["positive"] * len(x)))
+    evaluator = ShadowEvaluator(registry, "candidate", sample_rate=0.0)
+    assert not evaluator.submit(["Great book"], ["positive"])
+    evaluator.shutdown()
+    registry.get.assert_not_called()
+
+def test_shadow_drops_when_saturated():
+    """Test shadow requests are dropped, not queued, once max_pending is reached."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking_predict(x):
+        started.set()
+        release.wait(timeout=5)
+        return np.array(["positive"] * len(x))
+
+    evaluator = ShadowEvaluator(make_registry(blocking_predict), "candidate", sample_rate=1.0, max_workers=1, max_pending=1)
+    dropped_before = sample("shadow_requests_total", model="candidate", outcome="dropped")
+
+    assert evaluator.submit(["Great book"], ["positive"])
+    assert started.wait(timeout=5)
+    assert not evaluator.submit(["Another book"], ["positive"])
+    assert sample("shadow_requests_total", model="candidate", outcome="dropped") - dropped_before == 1
+
+    release.set()
+    evaluator._executor.shutdown(wait=True)
+    assert evaluator.submit(["Third book"], ["positive"]) is False  # executor is shut down
+
+def test_shadow_failure_is_contained():
+    """Test candidate errors are recorded without propagating."""
+    def failing_predict(x):
+        raise ValueError("broken candidate")
+
+    evaluator = ShadowEvaluator(make_registry(failing_predict), "candidate", sample_rate=1.0)
+    failed_before = sample("shadow_requests_total", model="candidate", outcome="failed")
+    assert evaluator.submit(["Great book"], ["positive"])
+    evaluator._executor.shutdown(wait=True)
+    assert sample("shadow_requests_total", model="candidate", outcome="failed") - failed_before == 1
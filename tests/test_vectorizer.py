@@ -0,0 +1,84 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from app.services.model_service import ModelService
+from app.services.vectorizer import MAX_CACHED_CHUNK_LENGTH, CachedPipeline, CachedTfidfVectorizer
+
+TRAIN = [
+    "I loved this book, the characters were great!",
+    "The plot was boring and the ending was bad.",
+    "It was okay, nothing special.",
+    "Great writing; I'd recommend it to anyone.",
+    "Bad, bad, bad. Not worth reading.",
+    "An okay read with a decent story-line.",
+]
+LABELS = ["positive", "negative", "neutral", "positive", "negative", "neutral"]
+INPUTS = [
+    "GREAT great Great book!!",
+    "the and of",  # only stop words
+    "",
+    "unknown-words everywhere, story-line okay",
+    "I'd   recommend\tthis\nbook",
+]
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"stop_words": "english"},
+    {"sublinear_tf": True, "norm": "l1"},
+    {"binary": True, "use_idf": False},
+    {"lowercase": False, "norm": None, "dtype": np.float32},
+])
+def test_cached_transform_matches_sklearn(params):
+    """Test the cached transform gives the same matrix as TfidfVectorizer.transform."""
+    vectorizer = TfidfVectorizer(**params).fit(TRAIN)
+    cached = CachedTfidfVectorizer(vectorizer, cache_size=16)
+    for _ in range(2):  # second pass is served from the cache
+        expected = vectorizer.transform(INPUTS)
+        actual = cached.transform(INPUTS)
+        assert actual.shape == expected.shape
+        assert actual.dtype == expected.dtype
+        np.testing.assert_array_equal(actual.indptr, expected.indptr)
+        np.testing.assert_array_equal(actual.indices, expected.indices)
+        np.testing.assert_allclose(actual.data, expected.data)
+
+def test_cache_is_bounded():
+    """Test the token cache never grows beyond its size."""
+    cached = CachedTfidfVectorizer(TfidfVectorizer().fit(TRAIN), cache_size=4)
+    cached.transform(TRAIN)
+    assert cached.lookup.cache_info().currsize == 4
+
+def test_long_chunks_are_not_cached():
+    """Test chunks over MAX_CACHED_CHUNK_LENGTH are resolved directly, without entering the cache."""
+    vectorizer = TfidfVectorizer().fit(TRAIN)
+    cached = CachedTfidfVectorizer(vectorizer, cache_size=16)
+    long_chunk = "great," + "x" * MAX_CACHED_CHUNK_LENGTH + ",book"
+    documents = [long_chunk, "great book"]
+    np.testing.assert_allclose(cached.transform(documents).toarray(), vectorizer.transform(documents).toarray())
+    assert cached.lookup.cache_info().currsize == 2
+
+@pytest.mark.parametrize("params", [
+    {"ngram_range": (1, 2)},
+    {"analyzer": "char"},
+    {"token_pattern": r"\S+"},
+])
+def test_unsupported_vectorizers(params):
+    """Test vectorizers whose analyzer can't be cached per chunk are rejected."""
+    assert not CachedTfidfVectorizer.supports(TfidfVectorizer(**params).fit(TRAIN))
+
+def test_cached_pipeline_from_model(test_model_path):
+    """Test supported pipelines get a cached pipeline with identical predictions."""
+    model = joblib.load(test_model_path)
+    cached = CachedPipeline.from_model(model, cache_size=100)
+    assert cached is not None
+    assert list(cached.predict(INPUTS)) == list(model.predict(INPUTS))
+    assert CachedPipeline.from_model(model, cache_size=0) is None
+    assert CachedPipeline.from_model(object(), cache_size=100) is None
+
+def test_model_service_uses_cached_pipeline(test_model_path):
+    """Test ModelService serves supported pipelines through the cached transform."""
+    model = joblib.load(test_model_path)
+    service = ModelService(model=model)
+    assert service.cached_pipeline is not None
+    assert service.predict(INPUTS) == model.predict(INPUTS).tolist()
+    assert service.cached_pipeline.vectorizer.lookup.cache_info().currsize > 0